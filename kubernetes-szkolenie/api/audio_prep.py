@@ -0,0 +1,121 @@
+import io
+import os
+import subprocess
+import wave
+from typing import Optional
+
+import numpy as np
+
+# Whisper i tak pracuje na 16 kHz mono - konwersja po stronie API zmniejsza
+# ruch przez brokera i koszt dekodowania na workerze.
+AUDIO_PREP = os.getenv("AUDIO_PREP", "1") == "1"
+TARGET_RATE = 16_000
+# "flac" (bezstratny) | "opus" | "wav"
+AUDIO_ENCODING = os.getenv("AUDIO_ENCODING", "flac")
+OPUS_BITRATE = os.getenv("AUDIO_OPUS_BITRATE", "24k")
+
+# Prosty energetyczny VAD do obciecia ciszy na poczatku i koncu nagrania
+TRIM_SILENCE = os.getenv("AUDIO_TRIM_SILENCE", "1") == "1"
+VAD_THRESHOLD_DB = float(os.getenv("AUDIO_VAD_THRESHOLD_DB", -45))
+VAD_FRAME_SECONDS = 0.03
+VAD_PADDING_SECONDS = 0.2
+
+_ENCODERS = {
+    "flac": ["-c:a", "flac", "-f", "flac"],
+    "opus": ["-c:a", "libopus", "-b:a", OPUS_BITRATE, "-application", "voip", "-f", "ogg"],
+}
+
+
+def settings() -> dict:
+    """
+        Ustawienia wplywajace na wynik transkrypcji - wchodza do klucza cache.
+    """
+    if not AUDIO_PREP:
+        return {}
+    return {
+        "prep_encoding": AUDIO_ENCODING,
+        "prep_trim": TRIM_SILENCE,
+        "prep_vad_db": VAD_THRESHOLD_DB,
+    }
+
+
+def _decode_pcm(audio_path: str) -> np.ndarray:
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-v", "error", "-i", audio_path,
+            "-ac", "1", "-ar", str(TARGET_RATE), "-f", "s16le", "pipe:1"
+        ],
+        capture_output=True, check=True, timeout=120
+    )
+    return np.frombuffer(proc.stdout, dtype=np.int16)
+
+
+def trim_silence(pcm: np.ndarray) -> np.ndarray:
+    """
+        Obcina cisze z poczatku i konca (RMS ramek 30 ms ponizej progu).
+        Nagranie bez zadnej ramki powyzej progu zwracane jest bez zmian.
+    """
+    frame = int(VAD_FRAME_SECONDS * TARGET_RATE)
+    n_frames = len(pcm) // frame
+    if n_frames == 0:
+        return pcm
+
+    frames = pcm[: n_frames * frame].astype(np.float32).reshape(n_frames, frame) / 32768.0
+    rms_db = 10 * np.log10(np.mean(frames ** 2, axis=1) + 1e-12)
+    voiced = np.flatnonzero(rms_db > VAD_THRESHOLD_DB)
+    if voiced.size == 0:
+        return pcm
+
+    padding = int(VAD_PADDING_SECONDS * TARGET_RATE)
+    start = max(0, voiced[0] * frame - padding)
+    end = min(len(pcm), (voiced[-1] + 1) * frame + padding)
+    return pcm[start:end]
+
+
+def _encode(pcm: np.ndarray) -> bytes:
+    if AUDIO_ENCODING not in _ENCODERS:
+        buffer = io.BytesIO()
+        with wave.open(buffer, "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(TARGET_RATE)
+            wav.writeframes(pcm.tobytes())
+        return buffer.getvalue()
+
+    proc = subprocess.run(
+        [
+            "ffmpeg", "-nostdin", "-v", "error",
+            "-f", "s16le", "-ar", str(TARGET_RATE), "-ac", "1", "-i", "pipe:0",
+            *_ENCODERS[AUDIO_ENCODING], "pipe:1"
+        ],
+        input=pcm.tobytes(), capture_output=True, check=True, timeout=120
+    )
+    return proc.stdout
+
+
+def prepare(audio_path: str) -> Optional[dict]:
+    """
+        Resampling do 16 kHz mono, obciecie ciszy i kompresja przed wyslaniem do workera.
+
+        :return: {"audio": bajty do wyslania, "duration": dlugosc po obcieciu [s], "format": kodek}
+                 albo None, jesli przygotowanie jest wylaczone lub ffmpeg zawiodl
+                 (wtedy wysylamy oryginalny plik).
+            :rtype: Optional[dict]
+    """
+    if not AUDIO_PREP:
+        return None
+
+    try:
+        pcm = _decode_pcm(audio_path)
+        if TRIM_SILENCE:
+            pcm = trim_silence(pcm)
+        audio = _encode(pcm)
+    except (OSError, subprocess.SubprocessError) as e:
+        print(f"[audio_prep] : ffmpeg error, sending original file: {e!r}")
+        return None
+
+    return {
+        "audio": audio,
+        "duration": len(pcm) / TARGET_RATE,
+        "format": AUDIO_ENCODING if AUDIO_ENCODING in _ENCODERS else "wav",
+    }
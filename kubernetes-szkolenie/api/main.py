@@ -1,37 +1,127 @@
 import base64
+import os
 import time
+import uuid
 from pathlib import Path
 from celery import Celery
 import gradio as gr
+import redis
+
+import audio_prep
+import metrics
+import routing
+from streaming import STREAM_QUEUE, StreamClient
+from result_cache import TranscriptionCache, content_key
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+# Musi byc zgodne z modelem i parametrami uzywanymi w worker/tasks.py
+MODEL_NAME = os.getenv("WHISPER_MODEL", "openai/whisper-small")
+TRANSCRIBE_PARAMS = {"return_timestamps": True}
+
+TIMEOUT_SECONDS = float(os.getenv("TRANSCRIBE_TIMEOUT", 250))
+POLL_INTERVAL = float(os.getenv("TRANSCRIBE_POLL_INTERVAL", 1))
+TIMEOUT_MESSAGE = "Przekroczono czas oczekiwania na wynik."
 
 celery = Celery(
     "tasks",
-    broker="redis://redis:6379/0",
-    backend="redis://redis:6379/0"
+    broker=REDIS_URL,
+    backend=REDIS_URL
+)
+
+redis_client = redis.Redis.from_url(REDIS_URL)
+
+result_cache = TranscriptionCache(
+    redis_client,
+    ttl_seconds=int(os.getenv("RESULT_CACHE_TTL", 7 * 24 * 3600)),
+    lru_size=int(os.getenv("RESULT_CACHE_LRU_SIZE", 512)),
 )
 
+stream_client = StreamClient(celery)
+
 def transcribe(audio_path: str) -> str:
     if not audio_path:
         return "Brak pliku audio."
 
+    with metrics.request_latency.time():
+        return _transcribe(audio_path)
+
+
+def _transcribe(audio_path: str) -> str:
     audio_bytes = Path(audio_path).read_bytes()
-    audio_b64 = base64.b64encode(audio_bytes).decode("utf-8")
-    task = celery.send_task("tasks.transcribe_audio", args=[audio_b64])
+    cache_key = content_key(audio_bytes, MODEL_NAME, {**TRANSCRIBE_PARAMS, **audio_prep.settings()})
+
+    cached = result_cache.get(cache_key)
+    if cached is not None:
+        metrics.cache_lookups.labels(result="hit").inc()
+        metrics.requests_total.labels(outcome="cached").inc()
+        return cached
+    metrics.cache_lookups.labels(result="miss").inc()
+
+    # Identyczne zgloszenia w toku czekaja na to samo zadanie
+    task_id = str(uuid.uuid4())
+    inflight_id = result_cache.claim_inflight(cache_key, task_id)
+    if inflight_id is not None:
+        task_id = inflight_id
+        metrics.requests_total.labels(outcome="coalesced").inc()
+    else:
+        prepared = audio_prep.prepare(audio_path)
+        if prepared is not None:
+            payload, duration = prepared["audio"], prepared["duration"]
+        else:
+            payload, duration = audio_bytes, routing.probe_duration(audio_path)
+        metrics.payload_bytes.labels(stage="uploaded").inc(len(audio_bytes))
+        metrics.payload_bytes.labels(stage="enqueued").inc(len(payload))
+
+        audio_b64 = base64.b64encode(payload).decode("utf-8")
+        lane = routing.route(duration)
+        try:
+            celery.send_task(
+                "tasks.transcribe_audio",
+                args=[audio_b64],
+                kwargs={"cache_key": cache_key, "enqueued_at": time.time()},
+                task_id=task_id,
+                **lane
+            )
+        except Exception:
+            result_cache.release_inflight(cache_key, task_id)
+            raise
 
-    timeout_seconds = 250
     start = time.time()
-    while time.time() - start < timeout_seconds:
-        result = celery.AsyncResult(task.id)
+    while time.time() - start < TIMEOUT_SECONDS:
+        result = celery.AsyncResult(task_id)
         if result.state == "SUCCESS":
-            return str(result.result)
+            text = str(result.result)
+            result_cache.set(cache_key, text)
+            result_cache.release_inflight(cache_key, task_id)
+            metrics.requests_total.labels(outcome="success").inc()
+            return text
         if result.state in {"FAILURE", "REVOKED"}:
+            result_cache.release_inflight(cache_key, task_id)
+            metrics.requests_total.labels(outcome="failure").inc()
             return f"Blad zadania: {result.state}"
-        time.sleep(1)
+        time.sleep(POLL_INTERVAL)
+
+    metrics.requests_total.labels(outcome="timeout").inc()
+    return TIMEOUT_MESSAGE
+
+
+def transcribe_stream(chunk, request: gr.Request) -> str:
+    if chunk is None:
+        return ""
+    sample_rate, data = chunk
+    return stream_client.push(request.session_hash, sample_rate, data)
+
+
+def finish_stream(request: gr.Request) -> str:
+    return stream_client.finish(request.session_hash)
 
-    return "Przekroczono czas oczekiwania na wynik."
 
+def close_stream(request: gr.Request) -> None:
+    stream_client.close(request.session_hash)
 
-ui = gr.Interface(
+
+upload_ui = gr.Interface(
     fn=transcribe,
     inputs=gr.Audio(type="filepath", label="Audio"),
     outputs=gr.Textbox(label="Transkrypcja"),
@@ -39,6 +129,20 @@ ui = gr.Interface(
     description="Wgraj plik audio, aby uzyskac transkrypcje przez Celery + Redis."
 )
 
+with gr.Blocks(title="Whisper Tiny Transcriber") as ui:
+    with gr.Tab("Plik"):
+        upload_ui.render()
+
+    with gr.Tab("Mikrofon (na zywo)"):
+        mic = gr.Audio(sources=["microphone"], type="numpy", streaming=True, label="Mikrofon")
+        live_text = gr.Textbox(label="Transkrypcja na zywo")
+
+        mic.stream(transcribe_stream, inputs=[mic], outputs=[live_text])
+        mic.stop_recording(finish_stream, inputs=None, outputs=[live_text])
+
+    ui.unload(close_stream)
+
 
 if __name__ == "__main__":
-    ui.launch(server_name="0.0.0.0", server_port=7860)
\ No newline at end of file
+    metrics.start_exporter(redis_client, queues=(*routing.QUEUES, STREAM_QUEUE))
+    ui.launch(server_name="0.0.0.0", server_port=7860)
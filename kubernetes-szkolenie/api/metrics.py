@@ -0,0 +1,74 @@
+import os
+from typing import Iterable
+
+from prometheus_client import Counter, Histogram, start_http_server
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", 9100))
+
+LATENCY_BUCKETS = (0.5, 1, 2.5, 5, 10, 20, 30, 60, 120, 250)
+
+request_latency = Histogram(
+    "transcription_request_seconds",
+    "Czas od wyslania pliku do otrzymania transkrypcji (po stronie API)",
+    buckets=LATENCY_BUCKETS
+)
+requests_total = Counter(
+    "transcription_requests_total",
+    "Zgloszenia transkrypcji wg wyniku",
+    ["outcome"]
+)
+payload_bytes = Counter(
+    "transcription_payload_bytes_total",
+    "Bajty audio: przeslane przez uzytkownika vs wyslane do kolejki po normalizacji",
+    ["stage"]
+)
+cache_lookups = Counter(
+    "transcription_cache_lookups_total",
+    "Odczyty cache wynikow",
+    ["result"]
+)
+
+
+class CeleryQueueCollector:
+    """
+        Dlugosc kolejek Celery odczytywana z Redisa (LLEN) przy kazdym scrape.
+
+        Jedyne zrodlo celery_queue_length (workery jej nie eksportuja) - podstawa
+        dla worker-hpa.yml.
+
+        Klient redis jest wstrzykiwany, wiec lokalnie mozna podac fakeredis.FakeRedis().
+    """
+
+    def __init__(self, client, queues: Iterable[str] = ("celery",)):
+        self.client = client
+        self.queues: list = list(queues)
+
+    def queue_length(self, queue: str) -> int:
+        return self.client.llen(queue)
+
+    def collect(self):
+        gauge = GaugeMetricFamily(
+            "celery_queue_length",
+            "Liczba zadan oczekujacych w kolejce Celery",
+            labels=["queue"]
+        )
+        for queue in self.queues:
+            gauge.add_metric([queue], self.queue_length(queue))
+        yield gauge
+
+
+def start_exporter(client, queues: Iterable[str] = ("celery",), port: int = METRICS_PORT) -> None:
+    REGISTRY.register(CeleryQueueCollector(client, queues))
+    start_http_server(port)
+
+
+if __name__ == "__main__":
+    # Lokalny podglad bez klastra: python metrics.py
+    import fakeredis
+    from prometheus_client import generate_latest
+
+    fake = fakeredis.FakeRedis()
+    fake.rpush("celery", *[b"job"] * 3)
+    REGISTRY.register(CeleryQueueCollector(fake))
+    print(generate_latest(REGISTRY).decode("utf-8"))
@@ -0,0 +1,115 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+import redis
+
+
+# Prefiks musi byc zgodny z RESULT_CACHE_PREFIX w worker/tasks.py
+RESULT_PREFIX = "transcription:result:"
+INFLIGHT_PREFIX = "transcription:inflight:"
+
+# Usuwa klucz tylko jesli nadal nalezy do danego zadania - GET i DEL w jednym
+# kroku, zeby nie skasowac rejestracji innego zadania po wygasnieciu klucza
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def _decode(raw) -> str:
+    return raw.decode("utf-8") if isinstance(raw, bytes) else str(raw)
+
+
+def content_key(audio_bytes: bytes, model: str, params: dict) -> str:
+    """
+        Klucz cache: hash tresci audio + nazwa modelu + parametry generowania.
+    """
+    digest = hashlib.sha256()
+    digest.update(audio_bytes)
+    digest.update(b"\0" + model.encode("utf-8"))
+    digest.update(b"\0" + json.dumps(params, sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class TranscriptionCache:
+    """
+        Dwupoziomowy cache wynikow transkrypcji: LRU w procesie + Redis z TTL.
+
+        Trzyma tez rejestr zadan "w locie" (w Redisie, wspolny dla replik API),
+        dzieki ktoremu identyczne zgloszenia czekaja na jedno zadanie Celery.
+    """
+
+    def __init__(
+        self,
+        client: redis.Redis,
+        ttl_seconds: int = 7 * 24 * 3600,
+        lru_size: int = 512,
+        inflight_ttl_seconds: int = 300,
+    ):
+        self.client = client
+        self.ttl_seconds: int = ttl_seconds
+        self.lru_size: int = lru_size
+        self.inflight_ttl_seconds: int = inflight_ttl_seconds
+
+        self._lru: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+        # Skrypt wywolywany zawsze z client=self.client - klienta mozna podmienic
+        # po utworzeniu (loadtest --fake przepina go na fakeredis)
+        self._release = client.register_script(_RELEASE_SCRIPT)
+
+    def _lru_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            if key not in self._lru:
+                return None
+            self._lru.move_to_end(key)
+            return self._lru[key]
+
+    def _lru_put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._lru[key] = text
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def get(self, key: str) -> Optional[str]:
+        text = self._lru_get(key)
+        if text is not None:
+            return text
+
+        raw = self.client.get(RESULT_PREFIX + key)
+        if raw is None:
+            return None
+
+        text = _decode(raw)
+        self._lru_put(key, text)
+        return text
+
+    def set(self, key: str, text: str) -> None:
+        self._lru_put(key, text)
+        self.client.set(RESULT_PREFIX + key, text, ex=self.ttl_seconds)
+
+    def claim_inflight(self, key: str, task_id: str) -> Optional[str]:
+        """
+            Probuje zarejestrowac task_id jako zadanie liczace dany klucz.
+
+            :return: None jesli rejestracja sie udala (trzeba wyslac zadanie),
+                     w przeciwnym razie id zadania, ktore juz jest w toku.
+                :rtype: Optional[str]
+        """
+        if self.client.set(INFLIGHT_PREFIX + key, task_id, nx=True, ex=self.inflight_ttl_seconds):
+            return None
+
+        existing = self.client.get(INFLIGHT_PREFIX + key)
+        if existing is None:
+            # Zadanie zdazylo sie zakonczyc miedzy SET a GET - probujemy jeszcze raz
+            return self.claim_inflight(key, task_id)
+
+        return _decode(existing)
+
+    def release_inflight(self, key: str, task_id: str) -> None:
+        self._release(keys=[INFLIGHT_PREFIX + key], args=[task_id], client=self.client)
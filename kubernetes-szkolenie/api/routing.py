@@ -0,0 +1,53 @@
+import json
+import os
+import subprocess
+import wave
+from typing import Optional
+
+# Krotkie nagrania ida do osobnej kolejki, zeby nie czekaly za wielominutowymi plikami
+FAST_QUEUE = os.getenv("FAST_QUEUE", "transcribe.fast")
+BULK_QUEUE = os.getenv("BULK_QUEUE", "transcribe.bulk")
+FAST_LANE_MAX_SECONDS = float(os.getenv("FAST_LANE_MAX_SECONDS", 30))
+
+# Nieznana dlugosc (probe sie nie powiodl) - traktujemy jak dlugie nagranie
+UNKNOWN_DURATION_QUEUE = os.getenv("UNKNOWN_DURATION_QUEUE", BULK_QUEUE)
+
+QUEUES = (FAST_QUEUE, BULK_QUEUE)
+
+
+def probe_duration(audio_path: str) -> Optional[float]:
+    """
+        Dlugosc nagrania w sekundach: najpierw naglowek WAV (bez dekodowania),
+        potem ffprobe. None, jesli nie da sie ustalic.
+    """
+    try:
+        with wave.open(audio_path, "rb") as wav:
+            return wav.getnframes() / float(wav.getframerate())
+    except (wave.Error, EOFError, OSError):
+        pass
+
+    try:
+        proc = subprocess.run(
+            ["ffprobe", "-v", "error", "-show_entries", "format=duration", "-of", "json", audio_path],
+            capture_output=True, text=True, timeout=10
+        )
+        return float(json.loads(proc.stdout)["format"]["duration"])
+    except (OSError, subprocess.SubprocessError, ValueError, KeyError, TypeError):
+        return None
+
+
+def route(duration: Optional[float]) -> dict:
+    """
+        Opcje dla celery.send_task: kolejka wg dlugosci nagrania.
+
+        Bez priorytetu wiadomosci - w obrebie pasa byl zawsze ten sam, wiec
+        niczego nie przestawial; kolejnosc pasow ustala queue_order_strategy workera.
+    """
+    if duration is None:
+        queue = UNKNOWN_DURATION_QUEUE
+    elif duration <= FAST_LANE_MAX_SECONDS:
+        queue = FAST_QUEUE
+    else:
+        queue = BULK_QUEUE
+
+    return {"queue": queue}
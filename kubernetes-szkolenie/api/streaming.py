@@ -0,0 +1,156 @@
+import base64
+import os
+import threading
+import uuid
+from typing import Optional
+
+import numpy as np
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from celery.utils import worker_direct
+
+STREAM_QUEUE = os.getenv("STREAM_QUEUE", "transcribe.stream")
+TARGET_RATE = 16_000
+# Pierwsza ramka moze trafic na zimny worker, kolejne czekaja krotko - jak nie zdaza,
+# wynik i tak przyjdzie z nastepna ramka (worker przetwarza je po kolei). Timeout
+# pierwszej ramki zaczyna sesje od nowa (patrz StreamClient._send).
+FIRST_CHUNK_TIMEOUT = float(os.getenv("STREAM_FIRST_CHUNK_TIMEOUT", 30))
+CHUNK_TIMEOUT = float(os.getenv("STREAM_CHUNK_TIMEOUT", 2))
+
+
+def to_pcm16k(sample_rate: int, data: np.ndarray) -> np.ndarray:
+    """
+        Ramka z gr.Audio(type="numpy") -> int16 mono 16 kHz.
+    """
+    data = np.asarray(data)
+    if data.ndim == 2:
+        data = data.mean(axis=1)
+
+    if np.issubdtype(data.dtype, np.integer):
+        audio = data.astype(np.float32) / np.iinfo(data.dtype).max
+    else:
+        audio = data.astype(np.float32)
+
+    if sample_rate != TARGET_RATE and audio.size:
+        n_out = int(round(audio.size * TARGET_RATE / sample_rate))
+        audio = np.interp(
+            np.linspace(0, audio.size - 1, n_out),
+            np.arange(audio.size),
+            audio
+        ).astype(np.float32)
+
+    return (np.clip(audio, -1.0, 1.0) * 32767).astype(np.int16)
+
+
+class StreamClient:
+    """
+        Strona API trybu mikrofonu: wysyla krotkie ramki PCM do workera i zwraca
+        tekst czesciowy. Pierwsza ramka idzie do wspolnej kolejki STREAM_QUEUE,
+        kolejne - do bezposredniej kolejki workera, ktory ja obsluzyl (tam jest stan sesji).
+
+        Sesje sa kluczowane gr.Request.session_hash, wiec unload() moze je posprzatac.
+    """
+
+    def __init__(self, celery):
+        self.celery = celery
+        self._sessions: dict = {}
+        self._lock = threading.Lock()
+        # Wyniki, na ktore nikt juz nie czeka: (AsyncResult, stream_id do zamkniecia albo None)
+        self._abandoned: list = []
+        self._abandoned_lock = threading.Lock()
+
+    def _session(self, session_hash: str) -> dict:
+        with self._lock:
+            if session_hash not in self._sessions:
+                self._sessions[session_hash] = {"stream_id": str(uuid.uuid4()), "worker": None, "text": ""}
+            return self._sessions[session_hash]
+
+    def _sweep_abandoned(self) -> None:
+        """
+            Sprzata wyniki po timeoutach, gdy juz dotarly do backendu - inaczej
+            zostaja w Redisie do result_expires. Sesja z nieprzypietej ramki jest
+            zamykana na workerze, ktory ja ostatecznie policzyl.
+        """
+        with self._abandoned_lock:
+            pending = []
+            for result, stream_id in self._abandoned:
+                if not result.ready():
+                    pending.append((result, stream_id))
+                    continue
+
+                reply = result.result if result.successful() else None
+                result.forget()
+                if stream_id is not None and isinstance(reply, dict) and reply.get("worker"):
+                    self.celery.send_task(
+                        "tasks.close_stream_session",
+                        args=[stream_id],
+                        queue=worker_direct(reply["worker"]),
+                        ignore_result=True
+                    )
+            self._abandoned = pending
+
+    def _send(self, session: dict, name: str, args: list) -> Optional[dict]:
+        self._sweep_abandoned()
+
+        pinned = session["worker"] is not None
+        queue = worker_direct(session["worker"]) if pinned else STREAM_QUEUE
+        result = self.celery.send_task(name, args=args, queue=queue)
+
+        try:
+            reply = result.get(timeout=CHUNK_TIMEOUT if pinned else FIRST_CHUNK_TIMEOUT)
+        except CeleryTimeoutError:
+            with self._abandoned_lock:
+                self._abandoned.append((result, None if pinned else session["stream_id"]))
+            if not pinned:
+                # Nie wiadomo, ktory worker ma stan tej sesji - kolejne ramki przez
+                # wspolna kolejke moglyby trafic gdzie indziej. Zaczynamy nowa sesje.
+                session["stream_id"] = str(uuid.uuid4())
+            return None
+
+        result.forget()
+        return reply
+
+    def push(self, session_hash: str, sample_rate: int, data: np.ndarray) -> str:
+        session = self._session(session_hash)
+        pcm = to_pcm16k(sample_rate, data)
+
+        reply = self._send(
+            session,
+            "tasks.transcribe_stream_chunk",
+            [session["stream_id"], base64.b64encode(pcm.tobytes()).decode("utf-8")]
+        )
+        if reply is not None:
+            session["worker"] = reply["worker"]
+            session["text"] = reply["text"]
+
+        return session["text"]
+
+    def finish(self, session_hash: str) -> str:
+        """
+            Koniec nagrania: worker zatwierdza reszte okna. Nastepne nagranie to nowa sesja.
+        """
+        with self._lock:
+            session = self._sessions.pop(session_hash, None)
+        if session is None:
+            return ""
+        if session["worker"] is None:
+            # Zadna ramka nie zostala przypieta - nie ma stanu do zatwierdzenia
+            return session["text"]
+
+        reply = self._send(session, "tasks.transcribe_stream_chunk", [session["stream_id"], "", True])
+        return reply["text"] if reply is not None else session["text"]
+
+    def close(self, session_hash: str) -> None:
+        """
+            Rozlaczenie przegladarki - zwalniamy stan sesji na workerze bez czekania na wynik.
+        """
+        with self._lock:
+            session = self._sessions.pop(session_hash, None)
+        if session is None or session["worker"] is None:
+            return
+
+        self.celery.send_task(
+            "tasks.close_stream_session",
+            args=[session["stream_id"]],
+            queue=worker_direct(session["worker"]),
+            ignore_result=True
+        )
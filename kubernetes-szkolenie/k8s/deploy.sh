@@ -1,5 +1,8 @@
 kubectl apply -f "redis-deployment.yml"
 kubectl apply -f "worker-deployment.yml"
+kubectl apply -f "worker-fast-deployment.yml"
+kubectl apply -f "worker-stream-deployment.yml"
 kubectl apply -f "api-deployment.yml"
 kubectl apply -f "redis-service.yml"
-kubectl apply -f "api-service.yml"
\ No newline at end of file
+kubectl apply -f "api-service.yml"
+kubectl apply -f "worker-hpa.yml"
\ No newline at end of file
@@ -0,0 +1,264 @@
+"""
+    Test obciazeniowy sciezki api -> Redis -> worker.
+
+    Generator wywoluje transcribe() z api/main.py z zadanym tempem naplywu (proces Poissona)
+    i mieszanka dlugosci nagran. Zamiast Whispera dziala model-atrapa, ktory spi
+    (albo liczy) proporcjonalnie do dlugosci audio.
+
+    Bez Redisa (fakeredis + broker w pamieci, wszystko w jednym procesie):
+        python loadtest/loadtest.py --fake --rate 2 --duration 60 --mix 5:0.7,60:0.25,600:0.05
+
+    Z lokalnym Redisem (docker run -p 6379:6379 redis):
+        python loadtest/loadtest.py --redis-url redis://localhost:6379/0 --workers 4
+
+    --no-stub: bez atrapy - zadania liczy prawdziwy worker podlaczony do tego samego Redisa.
+"""
+import argparse
+import base64
+import io
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import wave
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List
+
+API_DIR = Path(__file__).resolve().parent.parent / "api"
+
+# Niska czestotliwosc probkowania - liczy sie tylko dlugosc w naglowku, nie jakosc
+CLIP_RATE = 1000
+
+
+def parse_mix(spec: str) -> List[tuple]:
+    """
+        "5:0.7,60:0.3" -> [(5.0, 0.7), (60.0, 0.3)]  (dlugosc w sekundach : udzial)
+    """
+    mix = []
+    for part in spec.split(","):
+        seconds, weight = part.split(":")
+        mix.append((float(seconds), float(weight)))
+    return mix
+
+
+def make_clip(directory: str, seconds: float, rng: random.Random) -> str:
+    """
+        Unikalny (losowa tresc) plik WAV - zeby cache wynikow nie zafalszowal pomiaru.
+    """
+    fd, path = tempfile.mkstemp(suffix=".wav", dir=directory)
+    with os.fdopen(fd, "wb") as f, wave.open(f, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(1)
+        wav.setframerate(CLIP_RATE)
+        wav.writeframes(rng.randbytes(int(seconds * CLIP_RATE)))
+    return path
+
+
+def percentile(values: List[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class StubModel:
+    """
+        Atrapa modelu: czas "inferencji" = rtf * dlugosc audio (+ staly narzut).
+        Zapisuje czas oczekiwania w kolejce i inferencji dla kazdego zadania.
+    """
+
+    def __init__(self, rtf: float, overhead: float, busy: bool):
+        self.rtf: float = rtf
+        self.overhead: float = overhead
+        self.busy: bool = busy
+        self.timings: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def audio_seconds(audio: bytes) -> float:
+        try:
+            with wave.open(io.BytesIO(audio), "rb") as wav:
+                return wav.getnframes() / float(wav.getframerate())
+        except wave.Error:
+            pass
+
+        # Po normalizacji w API (--audio-prep) przychodzi FLAC/Opus
+        import routing
+
+        with tempfile.NamedTemporaryFile(suffix=".audio") as tmp:
+            tmp.write(audio)
+            tmp.flush()
+            return routing.probe_duration(tmp.name) or 0.0
+
+    def register(self, app) -> None:
+        stub = self
+
+        @app.task(name="tasks.transcribe_audio", bind=True)
+        def transcribe_audio(self, audio_b64: str, cache_key: str = None, enqueued_at: float = None):
+            started = time.time()
+
+            audio_seconds = stub.audio_seconds(base64.b64decode(audio_b64))
+
+            cost = stub.overhead + stub.rtf * audio_seconds
+            if stub.busy:
+                deadline = time.perf_counter() + cost
+                while time.perf_counter() < deadline:
+                    pass
+            else:
+                time.sleep(cost)
+
+            with stub._lock:
+                stub.timings[self.request.id] = {
+                    "wait": started - enqueued_at if enqueued_at else float("nan"),
+                    "inference": time.time() - started,
+                }
+            return f"stub {audio_seconds:.1f}s"
+
+
+def configure_api(args):
+    """
+        Import api/main.py i przepiecie go na fakeredis / broker w pamieci, jesli --fake.
+    """
+    if args.redis_url:
+        os.environ["REDIS_URL"] = args.redis_url
+    sys.path.insert(0, str(API_DIR))
+
+    import main as api
+
+    if args.fake:
+        import fakeredis
+
+        fake = fakeredis.FakeRedis()
+        api.redis_client = fake
+        api.result_cache.client = fake
+        api.celery.conf.broker_url = "memory://"
+        api.celery.conf.result_backend = "cache+memory://"
+
+    # Normalizacja audio (ffmpeg) domyslnie wylaczona - mierzymy kolejke i workera, nie ffmpeg
+    api.audio_prep.AUDIO_PREP = args.audio_prep
+    api.TIMEOUT_SECONDS = args.timeout
+    api.POLL_INTERVAL = args.poll_interval
+    return api
+
+
+def run(args) -> None:
+    api = configure_api(args)
+    import routing
+
+    stub = None
+    worker_ctx = None
+    if not args.no_stub:
+        from celery.contrib.testing.worker import start_worker
+
+        stub = StubModel(rtf=args.stub_rtf, overhead=args.stub_overhead, busy=args.stub_busy)
+        stub.register(api.celery)
+        worker_ctx = start_worker(
+            api.celery,
+            pool="threads",
+            concurrency=args.workers,
+            queues=list(routing.QUEUES),
+            perform_ping_check=False,
+            loglevel="WARNING",
+        )
+        worker_ctx.__enter__()
+
+    mix = parse_mix(args.mix)
+    rng = random.Random(args.seed)
+    records: List[dict] = []
+    records_lock = threading.Lock()
+
+    def one_request(path: str, seconds: float) -> None:
+        submitted = time.time()
+        text = api.transcribe(path)
+        finished = time.time()
+        with records_lock:
+            records.append({
+                "seconds": seconds,
+                "lane": routing.route(seconds)["queue"],
+                "latency": finished - submitted,
+                "timeout": text == api.TIMEOUT_MESSAGE,
+                "error": text.startswith("Blad"),
+            })
+        os.unlink(path)
+
+    clip_dir = tempfile.mkdtemp(prefix="loadtest-")
+    pool = ThreadPoolExecutor(max_workers=args.max_clients)
+
+    print(f"[loadtest] : rate={args.rate}/s, duration={args.duration}s, mix={args.mix}, workers={args.workers}")
+    started = time.time()
+    next_arrival = started
+    submitted = 0
+    try:
+        while next_arrival - started < args.duration:
+            time.sleep(max(0.0, next_arrival - time.time()))
+            seconds = rng.choices([m[0] for m in mix], weights=[m[1] for m in mix])[0]
+            pool.submit(one_request, make_clip(clip_dir, seconds, rng), seconds)
+            submitted += 1
+            next_arrival += rng.expovariate(args.rate)
+
+        pool.shutdown(wait=True)
+    finally:
+        if worker_ctx is not None:
+            worker_ctx.__exit__(None, None, None)
+
+    wall = time.time() - started
+    report(records, submitted, wall, stub)
+
+
+def report(records: List[dict], submitted: int, wall: float, stub: StubModel = None) -> None:
+    ok = [r for r in records if not r["timeout"] and not r["error"]]
+    latencies = [r["latency"] for r in ok]
+
+    print("\n" + "=" * 80)
+    print(f"Wyslane: {submitted}   ukonczone: {len(ok)}   timeouty: {sum(r['timeout'] for r in records)}   bledy: {sum(r['error'] for r in records)}")
+    print(f"Przepustowosc: {len(ok) / wall:.2f} zadan/s, {sum(r['seconds'] for r in ok) / wall:.1f} s audio/s (czas sciany {wall:.1f}s)")
+
+    print(f"\n{'':<18}{'n':>6}{'p50':>9}{'p90':>9}{'p95':>9}{'p99':>9}{'max':>9}")
+    groups = [("e2e (wszystkie)", latencies)]
+    for lane in sorted({r["lane"] for r in ok}):
+        groups.append((f"e2e {lane}", [r["latency"] for r in ok if r["lane"] == lane]))
+    if stub is not None and stub.timings:
+        groups.append(("kolejka (wait)", [t["wait"] for t in stub.timings.values()]))
+        groups.append(("inferencja", [t["inference"] for t in stub.timings.values()]))
+
+    for name, values in groups:
+        print(
+            f"{name:<18}{len(values):>6}"
+            + "".join(f"{percentile(values, q):>9.2f}" for q in (50, 90, 95, 99))
+            + f"{max(values, default=float('nan')):>9.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fake", action="store_true", help="fakeredis + broker w pamieci zamiast Redisa")
+    parser.add_argument("--redis-url", default=None)
+    parser.add_argument("--rate", type=float, default=1.0, help="Srednia liczba zgloszen na sekunde")
+    parser.add_argument("--duration", type=float, default=60.0, help="Czas generowania ruchu [s]")
+    parser.add_argument("--mix", default="5:0.7,60:0.25,600:0.05", help="dlugosc_s:udzial,...")
+    parser.add_argument("--workers", type=int, default=2, help="Rownolegle zadania atrapy workera")
+    parser.add_argument("--max-clients", type=int, default=256, help="Maks. rownoczesnych klientow")
+    parser.add_argument("--timeout", type=float, default=250.0)
+    parser.add_argument("--poll-interval", type=float, default=0.1)
+    parser.add_argument("--audio-prep", action="store_true", help="Wlacz normalizacje audio w API (wymaga ffmpeg)")
+    parser.add_argument("--no-stub", action="store_true", help="Zadania liczy prawdziwy worker")
+    parser.add_argument("--stub-rtf", type=float, default=0.1, help="Sekundy inferencji na sekunde audio")
+    parser.add_argument("--stub-overhead", type=float, default=0.2)
+    parser.add_argument("--stub-busy", action="store_true", help="Atrapa liczy (busy-wait) zamiast spac")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if not args.fake and not args.redis_url:
+        parser.error("podaj --fake albo --redis-url")
+    if args.fake and args.no_stub:
+        parser.error("--no-stub wymaga prawdziwego Redisa (--redis-url)")
+
+    run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+    Symulacja trybu mikrofonu: nagrany plik WAV odtwarzany jako strumien ramek
+    do worker/streaming.StreamSessions (bez Gradio, Redisa i Celery).
+
+    Atrapa modelu (domyslnie) albo prawdziwy Whisper:
+        python loadtest/replay_stream.py probka.wav --frame-ms 500 --speed 1
+        python loadtest/replay_stream.py probka.wav --model openai/whisper-small
+
+    Raportuje czas do pierwszego tekstu (TTFT), opoznienie przetwarzania ramek
+    i sprawdza, ze sesja zostala posprzatana (koniec nagrania / rozlaczenie).
+"""
+import argparse
+import sys
+import time
+import wave
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "worker"))
+
+from streaming import SAMPLING_RATE, StreamSessions  # noqa: E402
+
+
+def read_wav(path: str) -> np.ndarray:
+    with wave.open(path, "rb") as wav:
+        rate, channels, width = wav.getframerate(), wav.getnchannels(), wav.getsampwidth()
+        raw = wav.readframes(wav.getnframes())
+
+    if width != 2:
+        raise ValueError("Obslugiwany jest tylko 16-bitowy PCM WAV")
+
+    audio = np.frombuffer(raw, dtype=np.int16).astype(np.float32) / 32768.0
+    if channels > 1:
+        audio = audio.reshape(-1, channels).mean(axis=1)
+
+    if rate != SAMPLING_RATE:
+        n_out = int(round(audio.size * SAMPLING_RATE / rate))
+        audio = np.interp(np.linspace(0, audio.size - 1, n_out), np.arange(audio.size), audio).astype(np.float32)
+
+    return audio
+
+
+def stub_transcriber(rtf: float):
+    def transcribe(audio: np.ndarray) -> str:
+        seconds = audio.size / SAMPLING_RATE
+        time.sleep(rtf * seconds)
+        return f"<{seconds:.1f}s>"
+    return transcribe
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("wav")
+    parser.add_argument("--frame-ms", type=int, default=500)
+    parser.add_argument("--speed", type=float, default=1.0, help="1 = czas rzeczywisty, 0 = bez czekania")
+    parser.add_argument("--model", default=None, help="Nazwa modelu Whisper; bez niej atrapa")
+    parser.add_argument("--backend", default="pytorch")
+    parser.add_argument("--stub-rtf", type=float, default=0.05)
+    parser.add_argument("--disconnect-at", type=float, default=None,
+                        help="Przerwij po tylu sekundach audio bez zamkniecia sesji (test sprzatania)")
+    args = parser.parse_args()
+
+    if args.model:
+        from model import WhisperModel
+
+        model = WhisperModel(args.model, backend=args.backend)
+        model.warm_up()
+        transcriber = lambda audio: model(audio)["text"]
+    else:
+        transcriber = stub_transcriber(args.stub_rtf)
+
+    sessions = StreamSessions(transcriber, idle_ttl=5.0)
+    audio = read_wav(args.wav)
+    frame = int(args.frame_ms / 1000 * SAMPLING_RATE)
+
+    started = time.perf_counter()
+    ttft = None
+    chunk_latencies = []
+    last_text = ""
+
+    for offset in range(0, audio.size, frame):
+        audio_time = offset / SAMPLING_RATE
+        if args.disconnect_at is not None and audio_time >= args.disconnect_at:
+            break
+
+        if args.speed > 0:
+            time.sleep(max(0.0, started + audio_time / args.speed - time.perf_counter()))
+
+        t0 = time.perf_counter()
+        text = sessions.feed("replay", audio[offset:offset + frame])
+        chunk_latencies.append(time.perf_counter() - t0)
+
+        if text and ttft is None:
+            ttft = time.perf_counter() - started
+        if text != last_text:
+            print(f"[{audio_time + args.frame_ms / 1000:7.2f}s] {text}")
+            last_text = text
+
+    if args.disconnect_at is None:
+        text = sessions.feed("replay", np.zeros(0, dtype=np.float32), final=True)
+        print(f"\nTekst koncowy: {text}")
+    else:
+        time.sleep(sessions.idle_ttl + 0.1)
+        sessions.evict_idle()
+
+    chunk_latencies.sort()
+    print(f"\nTTFT: {ttft:.2f}s" if ttft is not None else "\nTTFT: brak tekstu")
+    if chunk_latencies:
+        print(
+            f"Ramki: {len(chunk_latencies)}, opoznienie p50={chunk_latencies[len(chunk_latencies) // 2] * 1000:.0f} ms, "
+            f"p95={chunk_latencies[int(len(chunk_latencies) * 0.95)] * 1000:.0f} ms"
+        )
+    print(f"Otwarte sesje po zakonczeniu: {len(sessions)}")
+
+
+if __name__ == "__main__":
+    main()
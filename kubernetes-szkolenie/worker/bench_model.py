@@ -0,0 +1,99 @@
+"""
+    Porownanie backendow modelu Whisper: czas ladowania, RSS i real-time factor (RTF).
+
+    Kazdy backend mierzony jest w osobnym procesie, zeby RSS nie byl zaburzony
+    przez poprzednio zaladowane modele.
+
+    python bench_model.py --audio probka.wav --backends pytorch int8 onnx
+"""
+import argparse
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from model import BACKENDS, SAMPLING_RATE, WhisperModel, current_rss_mb
+
+
+def bench_single(model_name: str, backend: str, audio_path: str, seconds: float, runs: int) -> dict:
+    if audio_path:
+        from transformers.pipelines.audio_utils import ffmpeg_read
+        audio = ffmpeg_read(Path(audio_path).read_bytes(), SAMPLING_RATE)
+    else:
+        audio = (np.random.default_rng(0).standard_normal(int(seconds * SAMPLING_RATE)) * 0.01).astype(np.float32)
+
+    audio_seconds = len(audio) / SAMPLING_RATE
+
+    rss_start = current_rss_mb()
+    model = WhisperModel(model_name, backend=backend)
+    model.load()
+
+    warm_start = time.perf_counter()
+    model.warm_up()
+    warm_up_seconds = time.perf_counter() - warm_start
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        model(audio, return_timestamps=True)
+        timings.append(time.perf_counter() - start)
+
+    inference_seconds = sorted(timings)[len(timings) // 2]
+
+    return {
+        "backend": backend,
+        "load_seconds": model.load_seconds,
+        "warm_up_seconds": warm_up_seconds,
+        "rss_mb": current_rss_mb() - rss_start,
+        "audio_seconds": audio_seconds,
+        "inference_seconds": inference_seconds,
+        "rtf": inference_seconds / audio_seconds,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default="openai/whisper-small")
+    parser.add_argument("--backends", nargs="+", default=list(BACKENDS), choices=BACKENDS)
+    parser.add_argument("--audio", default=None, help="Plik audio; bez niego szum o dlugosci --seconds")
+    parser.add_argument("--seconds", type=float, default=30.0)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--single", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(bench_single(args.model, args.backends[0], args.audio, args.seconds, args.runs)))
+        return
+
+    rows = []
+    for backend in args.backends:
+        cmd = [
+            sys.executable, __file__, "--single",
+            "--model", args.model,
+            "--backends", backend,
+            "--seconds", str(args.seconds),
+            "--runs", str(args.runs),
+        ]
+        if args.audio:
+            cmd += ["--audio", args.audio]
+
+        proc = subprocess.run(cmd, capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"[{backend}] : blad\n{proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else ''}")
+            continue
+
+        rows.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    print(f"\n{'backend':<10}{'load [s]':>10}{'warm-up [s]':>13}{'RSS [MB]':>10}{'infer [s]':>11}{'RTF':>8}")
+    for row in rows:
+        print(
+            f"{row['backend']:<10}{row['load_seconds']:>10.2f}{row['warm_up_seconds']:>13.2f}"
+            f"{row['rss_mb']:>10.0f}{row['inference_seconds']:>11.2f}{row['rtf']:>8.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+from prometheus_client.core import REGISTRY
+
+METRICS_PORT = int(os.getenv("METRICS_PORT", 9100))
+
+WAIT_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+INFERENCE_BUCKETS = (0.25, 0.5, 1, 2.5, 5, 10, 20, 40, 80, 160)
+
+task_wait = Histogram(
+    "transcription_queue_wait_seconds",
+    "Czas od wyslania zadania przez API do rozpoczecia na workerze",
+    buckets=WAIT_BUCKETS
+)
+inference_duration = Histogram(
+    "transcription_inference_seconds",
+    "Czas inferencji modelu dla jednego zadania",
+    buckets=INFERENCE_BUCKETS
+)
+audio_seconds = Counter(
+    "transcription_audio_seconds_total",
+    "Sekundy przetworzonego audio (rate() = sekundy audio na sekunde zegara)"
+)
+inference_seconds = Counter(
+    "transcription_inference_seconds_total",
+    "Laczny czas inferencji"
+)
+model_memory = Gauge(
+    "whisper_model_rss_bytes",
+    "Przyrost RSS po zaladowaniu modelu",
+    multiprocess_mode="max"
+)
+
+
+def record_task(wait_seconds: float, audio_len_seconds: float, infer_seconds: float) -> None:
+    if wait_seconds is not None and wait_seconds >= 0:
+        task_wait.observe(wait_seconds)
+    inference_duration.observe(infer_seconds)
+    audio_seconds.inc(audio_len_seconds)
+    inference_seconds.inc(infer_seconds)
+
+
+def start_exporter(port: int = METRICS_PORT) -> None:
+    """
+        Uruchamiane w procesie glownym workera. Przy puli prefork metryki z procesow
+        potomnych zbiera MultiProcessCollector (wymaga PROMETHEUS_MULTIPROC_DIR).
+
+        Dlugosci kolejek (celery_queue_length) eksportuje tylko API - kazdy pod
+        workera liczylby te sama kolejke jeszcze raz, a HPA sumowaloby kopie.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+
+    start_http_server(port, registry=registry)
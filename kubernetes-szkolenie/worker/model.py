@@ -0,0 +1,159 @@
+import os
+import resource
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+SAMPLING_RATE = 16_000
+BACKENDS = ("pytorch", "int8", "onnx")
+
+
+def current_rss_mb() -> float:
+    """
+        Aktualne RSS procesu w MB (Linux: /proc/self/statm, inaczej maksimum z getrusage).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _build_pytorch(model_name: str):
+    from transformers import pipeline
+
+    return pipeline("automatic-speech-recognition", model=model_name, device=-1)
+
+
+def _build_int8(model_name: str):
+    import torch
+    from transformers import AutoModelForSpeechSeq2Seq, AutoProcessor, pipeline
+
+    model = AutoModelForSpeechSeq2Seq.from_pretrained(model_name)
+    model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    processor = AutoProcessor.from_pretrained(model_name)
+
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor,
+        device=-1
+    )
+
+
+def _build_onnx(model_name: str):
+    try:
+        from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+    except ImportError as e:
+        raise RuntimeError("Backend 'onnx' wymaga pakietu: pip install optimum[onnxruntime]") from e
+    from transformers import AutoProcessor, pipeline
+
+    model = ORTModelForSpeechSeq2Seq.from_pretrained(model_name, export=True)
+    processor = AutoProcessor.from_pretrained(model_name)
+
+    return pipeline(
+        "automatic-speech-recognition",
+        model=model,
+        tokenizer=processor.tokenizer,
+        feature_extractor=processor.feature_extractor
+    )
+
+
+_BUILDERS = {
+    "pytorch": _build_pytorch,
+    "int8": _build_int8,
+    "onnx": _build_onnx,
+}
+
+
+class WhisperModel:
+    """
+        Zarzadzany model ASR: jednokrotne ladowanie (thread-safe), rozgrzewka i stan gotowosci.
+
+        Zaladowany w procesie-matce Celery (przed forkiem) jest wspoldzielony
+        przez procesy potomne prefork w trybie copy-on-write.
+
+        :param model_name: Nazwa modelu z Hugging Face Hub
+            :type model_name: str
+
+        :param backend: Jeden z BACKENDS: "pytorch", "int8" (dynamiczna kwantyzacja) lub "onnx" (ONNX Runtime)
+            :type backend: str
+
+        :param ready_file: Plik tworzony po rozgrzewce (np. dla readinessProbe w k8s)
+            :type ready_file: Optional[str]
+    """
+
+    def __init__(self, model_name: str, backend: str = "pytorch", ready_file: Optional[str] = None):
+        if backend not in BACKENDS:
+            raise ValueError(f"Nieznany backend '{backend}', dostepne: {', '.join(BACKENDS)}")
+
+        self.model_name: str = model_name
+        self.backend: str = backend
+        self.ready_file: Optional[str] = ready_file
+
+        self.load_seconds: Optional[float] = None
+        self.rss_mb: Optional[float] = None
+        self.warmed_up: bool = False
+
+        self._pipe = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._pipe is not None
+
+    @property
+    def ready(self) -> bool:
+        return self.loaded and self.warmed_up
+
+    def load(self):
+        if self._pipe is not None:
+            return self._pipe
+
+        with self._lock:
+            if self._pipe is None:
+                rss_before = current_rss_mb()
+                start = time.perf_counter()
+                self._pipe = _BUILDERS[self.backend](self.model_name)
+                self.load_seconds = time.perf_counter() - start
+                self.rss_mb = current_rss_mb() - rss_before
+
+                print(
+                    f"[WhisperModel] : {self.model_name} ({self.backend}) "
+                    f"loaded in {self.load_seconds:.2f} s, +{self.rss_mb:.0f} MB RSS"
+                )
+
+        return self._pipe
+
+    def warm_up(self, seconds: float = 1.0) -> None:
+        """
+            Pierwsze wywolanie inicjalizuje leniwe struktury (watki, bufory), wiec
+            robimy je na ciszy, zanim przyjdzie prawdziwe zadanie.
+        """
+        if self.warmed_up:
+            return
+
+        self(np.zeros(int(seconds * SAMPLING_RATE), dtype=np.float32))
+        self.warmed_up = True
+
+        if self.ready_file:
+            Path(self.ready_file).touch()
+
+    def status(self) -> dict:
+        return {
+            "model": self.model_name,
+            "backend": self.backend,
+            "loaded": self.loaded,
+            "ready": self.ready,
+            "load_seconds": self.load_seconds,
+            "rss_mb": self.rss_mb,
+        }
+
+    def __call__(self, audio: np.ndarray, **kwargs) -> dict:
+        pipe = self.load()
+        return pipe({"raw": audio, "sampling_rate": SAMPLING_RATE}, **kwargs)
@@ -0,0 +1,127 @@
+import threading
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+SAMPLING_RATE = 16_000
+
+
+class StreamSession:
+    """
+        Stan jednej sesji strumieniowej: zatwierdzony tekst + okno audio, ktore
+        jeszcze moze sie zmienic (dekodowane ponownie przy kolejnych ramkach).
+    """
+
+    def __init__(self, stream_id: str):
+        self.stream_id: str = stream_id
+        self.committed: List[str] = []
+        self.partial: str = ""
+        self.pending: np.ndarray = np.zeros(0, dtype=np.float32)
+        self.samples_since_decode: int = 0
+        self.last_seen: float = time.monotonic()
+
+    @property
+    def text(self) -> str:
+        return " ".join(t for t in self.committed + [self.partial] if t).strip()
+
+
+class StreamSessions:
+    """
+        Rejestr sesji strumieniowych w procesie workera.
+
+        Po kazdych decode_every sekundach nowego audio okno jest dekodowane ponownie
+        (wynik czesciowy). Okno jest zatwierdzane, gdy konczy sie cisza albo przekracza
+        max_window sekund - dzieki temu koszt dekodowania nie rosnie z dlugoscia sesji.
+        Sesje bez ramek przez idle_ttl sekund sa usuwane (rozlaczenie bez zamkniecia).
+
+        :param transcriber: Funkcja audio (float32, 16 kHz) -> tekst
+            :type transcriber: Callable
+    """
+
+    def __init__(
+        self,
+        transcriber: Callable[[np.ndarray], str],
+        decode_every: float = 1.0,
+        max_window: float = 20.0,
+        min_commit: float = 2.0,
+        silence_seconds: float = 0.6,
+        silence_db: float = -45.0,
+        idle_ttl: float = 120.0,
+    ):
+        self.transcriber = transcriber
+        self.decode_every: int = int(decode_every * SAMPLING_RATE)
+        self.max_window: int = int(max_window * SAMPLING_RATE)
+        self.min_commit: int = int(min_commit * SAMPLING_RATE)
+        self.silence_samples: int = int(silence_seconds * SAMPLING_RATE)
+        self.silence_db: float = silence_db
+        self.idle_ttl: float = idle_ttl
+
+        self._sessions: Dict[str, StreamSession] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def _ends_with_silence(self, audio: np.ndarray) -> bool:
+        tail = audio[-self.silence_samples:]
+        rms_db = 10 * np.log10(np.mean(tail.astype(np.float32) ** 2) + 1e-12)
+        return rms_db < self.silence_db
+
+    def _decode(self, session: StreamSession) -> None:
+        session.partial = self.transcriber(session.pending).strip() if session.pending.size else ""
+        session.samples_since_decode = 0
+
+    def _commit(self, session: StreamSession) -> None:
+        if session.samples_since_decode:
+            self._decode(session)
+        if session.partial:
+            session.committed.append(session.partial)
+        session.partial = ""
+        session.pending = np.zeros(0, dtype=np.float32)
+
+    def evict_idle(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            stale = [sid for sid, s in self._sessions.items() if now - s.last_seen > self.idle_ttl]
+            for sid in stale:
+                del self._sessions[sid]
+        return len(stale)
+
+    def feed(self, stream_id: str, audio: np.ndarray, final: bool = False) -> str:
+        """
+            Dokleja ramke audio do sesji i zwraca aktualny (czesciowy) tekst.
+            final=True zatwierdza reszte okna i konczy sesje.
+        """
+        self.evict_idle()
+
+        with self._lock:
+            session = self._sessions.get(stream_id)
+            if session is None:
+                session = self._sessions[stream_id] = StreamSession(stream_id)
+
+            session.last_seen = time.monotonic()
+            if audio.size:
+                session.pending = np.concatenate([session.pending, audio.astype(np.float32)])
+                session.samples_since_decode += audio.size
+
+            if final:
+                self._commit(session)
+                del self._sessions[stream_id]
+                return session.text
+
+            if session.samples_since_decode >= self.decode_every:
+                self._decode(session)
+
+                if session.pending.size >= self.max_window or (
+                    session.pending.size >= self.min_commit and self._ends_with_silence(session.pending)
+                ):
+                    self._commit(session)
+
+            # Czas dekodowania nie moze sie liczyc jako bezczynnosc sesji
+            session.last_seen = time.monotonic()
+            return session.text
+
+    def close(self, stream_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(stream_id, None) is not None
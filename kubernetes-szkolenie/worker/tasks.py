@@ -1,30 +1,155 @@
 from celery import Celery
+from celery.signals import worker_init, worker_process_init, worker_ready
 import base64
-from pathlib import Path
-import tempfile
-from transformers import pipeline
+import os
+import threading
+import time
+import numpy as np
+import redis
+from transformers.pipelines.audio_utils import ffmpeg_read
+
+import metrics
+from model import SAMPLING_RATE, WhisperModel
+from streaming import StreamSessions
+
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379/0")
+
+# Musi byc zgodne z MODEL_NAME / TRANSCRIBE_PARAMS w api/main.py (wchodza do klucza cache)
+MODEL_NAME = os.getenv("WHISPER_MODEL", "openai/whisper-small")
+GENERATE_KWARGS = {"return_timestamps": True}
+
+# "pytorch" | "int8" | "onnx" - patrz model.BACKENDS
+WHISPER_BACKEND = os.getenv("WHISPER_BACKEND", "pytorch")
+# 1 - model ladowany w procesie-matce przed forkiem (copy-on-write), 0 - w kazdym procesie wykonujacym
+WHISPER_PRELOAD = os.getenv("WHISPER_PRELOAD", "1") == "1"
+WHISPER_NUM_THREADS = int(os.getenv("WHISPER_NUM_THREADS", 0))
+
+# Kolejki (pasy) obslugiwane przez ten worker - zgodne z api/routing.py; ustawiane tez przez -Q
+WORKER_QUEUES = os.getenv("WORKER_QUEUES", "transcribe.stream,transcribe.fast,transcribe.bulk").split(",")
+
+# Musi byc zgodne z RESULT_PREFIX w api/result_cache.py
+RESULT_CACHE_PREFIX = "transcription:result:"
+RESULT_CACHE_TTL = int(os.getenv("RESULT_CACHE_TTL", 7 * 24 * 3600))
 
 celery = Celery(
     "tasks",
-    broker="redis://redis:6379/0",
-    backend="redis://redis:6379/0"
+    broker=REDIS_URL,
+    backend=REDIS_URL
 )
 
-# Ładowanie modelu ASR Whisper Tiny
-transcriber = pipeline(
-    "automatic-speech-recognition",
-    model="openai/whisper-small"
+# prefetch 1: worker nie rezerwuje kolejnych zadan, gdy liczy dlugie nagranie.
+# queue_order_strategy=priority: worker obslugujacy oba pasy zawsze najpierw oproznia pierwszy z listy.
+# worker_direct: kolejka <hostname>.dq2, przez ktora API przypina sesje strumieniowa do jednego workera.
+celery.conf.update(
+    task_default_queue=WORKER_QUEUES[0],
+    worker_direct=True,
+    worker_prefetch_multiplier=int(os.getenv("WORKER_PREFETCH_MULTIPLIER", 1)),
+    task_acks_late=True,
+    broker_transport_options={"queue_order_strategy": "priority"},
 )
 
-@celery.task(name="tasks.transcribe_audio")
-def transcribe_audio(audio_b64: str):
-    audio_bytes = base64.b64decode(audio_b64)
-    with tempfile.NamedTemporaryFile(suffix=".wav", delete=False) as tmp:
-        tmp.write(audio_bytes)
-        tmp_path = Path(tmp.name)
+result_cache = redis.Redis.from_url(REDIS_URL)
+
+# Model ASR Whisper - ladowany przez sygnaly workera, nie przy imporcie modulu
+transcriber = WhisperModel(
+    MODEL_NAME,
+    backend=WHISPER_BACKEND,
+    ready_file=os.getenv("WHISPER_READY_FILE", "/tmp/whisper-ready")
+)
+
+# Sesje trybu mikrofonu - stan w pamieci procesu, wiec pas stream wymaga puli solo/threads
+stream_sessions = StreamSessions(
+    lambda audio: transcriber(audio)["text"],
+    decode_every=float(os.getenv("STREAM_DECODE_EVERY", 1.0)),
+    max_window=float(os.getenv("STREAM_MAX_WINDOW", 20.0)),
+    idle_ttl=float(os.getenv("STREAM_IDLE_TTL", 120.0)),
+)
+
+
+@worker_init.connect
+def preload_model(**kwargs):
+    metrics.start_exporter()
+
+    # Proces-matka, przed forkiem - wagi wspoldzielone przez dzieci prefork.
+    # Bez inferencji tutaj: watki OpenMP uruchomione przed forkiem potrafia zakleszczyc dzieci.
+    if WHISPER_PRELOAD:
+        transcriber.load()
+
+
+def _set_num_threads():
+    if WHISPER_NUM_THREADS:
+        import torch
+        torch.set_num_threads(WHISPER_NUM_THREADS)
+
+
+# Rozgrzewka dziecka prefork trwa dluzej niz worker_proc_alive_timeout (4 s) - handler
+# worker_process_init musi wrocic od razu, wiec liczy ja watek w tle, a zadania czekaja na nia
+_child_warm = threading.Event()
+_child_warm.set()
 
+
+def _warm_up_child_background():
     try:
-        result = transcriber(str(tmp_path), return_timestamps=True)
-        return result["text"]
+        _set_num_threads()
+        transcriber.warm_up()
+        metrics.model_memory.set((transcriber.rss_mb or 0) * 1024 * 1024)
+    except Exception as e:
+        # Zadanie i tak zaladuje model samo - rozgrzewka to tylko optymalizacja
+        print(f"[warm_up_child] : rozgrzewka nieudana: {e!r}")
     finally:
-        tmp_path.unlink(missing_ok=True)
\ No newline at end of file
+        _child_warm.set()
+
+
+@worker_process_init.connect
+def warm_up_child(**kwargs):
+    _child_warm.clear()
+    threading.Thread(target=_warm_up_child_background, name="whisper-warm-up", daemon=True).start()
+
+
+@worker_ready.connect
+def warm_up_inline(sender=None, **kwargs):
+    # Pule solo/threads wykonuja zadania w procesie glownym - worker_process_init nie jest wysylany
+    pool_module = type(getattr(sender, "pool", None)).__module__
+    if not pool_module.endswith("prefork"):
+        _set_num_threads()
+        transcriber.warm_up()
+        metrics.model_memory.set((transcriber.rss_mb or 0) * 1024 * 1024)
+
+
+@celery.task(name="tasks.transcribe_audio")
+def transcribe_audio(audio_b64: str, cache_key: str = None, enqueued_at: float = None):
+    wait_seconds = time.time() - enqueued_at if enqueued_at else None
+
+    if cache_key:
+        cached = result_cache.get(RESULT_CACHE_PREFIX + cache_key)
+        if cached is not None:
+            return cached.decode("utf-8")
+
+    audio_bytes = base64.b64decode(audio_b64)
+    audio = ffmpeg_read(audio_bytes, SAMPLING_RATE)
+
+    # Pierwsze zadanie dziecka nie liczy rownolegle z rozgrzewka
+    _child_warm.wait()
+
+    start = time.perf_counter()
+    result = transcriber(audio, **GENERATE_KWARGS)
+    metrics.record_task(wait_seconds, len(audio) / SAMPLING_RATE, time.perf_counter() - start)
+
+    if cache_key:
+        result_cache.set(RESULT_CACHE_PREFIX + cache_key, result["text"], ex=RESULT_CACHE_TTL)
+
+    return result["text"]
+
+
+@celery.task(name="tasks.transcribe_stream_chunk", bind=True)
+def transcribe_stream_chunk(self, stream_id: str, pcm_b64: str, final: bool = False):
+    # PCM 16-bit mono 16 kHz (konwersja po stronie API)
+    audio = np.frombuffer(base64.b64decode(pcm_b64), dtype=np.int16).astype(np.float32) / 32768.0
+    _child_warm.wait()
+    text = stream_sessions.feed(stream_id, audio, final=final)
+    return {"text": text, "worker": self.request.hostname}
+
+
+@celery.task(name="tasks.close_stream_session")
+def close_stream_session(stream_id: str):
+    return stream_sessions.close(stream_id)
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import TYPE_CHECKING, Optional
+
+# asyncio / aiohttp / requests / ssl sa importowane dopiero przy tworzeniu
+# sesji - sam import tego modulu (np. w podkomendach CLI bez sieci) jest tani
+if TYPE_CHECKING:
+    import asyncio
+    import aiohttp
+    import requests
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+
+# Centralne limity i timeouty dla wszystkich scraperow
+LIMIT = 100
+LIMIT_PER_HOST = 20
+DNS_TTL = 300
+KEEPALIVE_TIMEOUT = 60
+TIMEOUT_TOTAL = 60
+TIMEOUT_CONNECT = 10
+TIMEOUT_SOCK_READ = 20
+
+# ClientSession jest zwiazana z petla zdarzen - jedna sesja na petle
+_sessions: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, aiohttp.ClientSession]" = weakref.WeakKeyDictionary()
+_ssl_context = None
+_default_headers: Optional[dict] = None
+
+_sync_session: Optional[requests.Session] = None
+_sync_lock = threading.Lock()
+
+
+def default_headers() -> dict:
+    """
+        Naglowki wspolne dla wszystkich sesji. 'br' tylko gdy zainstalowany jest
+        Brotli / brotlicffi - bez nich aiohttp nie zdekoduje odpowiedzi.
+    """
+    global _default_headers
+
+    if _default_headers is None:
+        encodings = "gzip, deflate"
+        for module in ("brotli", "brotlicffi"):
+            try:
+                __import__(module)
+                encodings += ", br"
+                break
+            except ImportError:
+                pass
+        _default_headers = {
+            "User-Agent": USER_AGENT,
+            "Accept-Encoding": encodings,
+        }
+
+    return _default_headers
+
+
+def create_session(limit: int = LIMIT, limit_per_host: int = LIMIT_PER_HOST) -> aiohttp.ClientSession:
+    """
+        Nowa ClientSession z centralnymi naglowkami, timeoutami i kontekstem TLS.
+        Wlasnosc wywolujacego - zamknac po uzyciu (np. `async with`). Do zwyklego
+        pobierania uzywac get_session(); ta funkcja jest dla przypadkow z innymi
+        limitami polaczen (np. benchmark bez limitu: limit=0, limit_per_host=0).
+
+        :param limit: Maks. polaczen razem (0 = bez limitu)
+            :type limit: int
+
+        :param limit_per_host: Maks. polaczen do jednego hosta (0 = bez limitu)
+            :type limit_per_host: int
+
+        :return: Nowa sesja
+            :rtype: aiohttp.ClientSession
+    """
+    global _ssl_context
+    import ssl
+    import aiohttp
+
+    # Jeden kontekst TLS dla wszystkich polaczen (ladowanie CA raz na proces)
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        use_dns_cache=True,
+        ttl_dns_cache=DNS_TTL,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ssl=_ssl_context,
+    )
+    return aiohttp.ClientSession(
+        headers=default_headers(),
+        timeout=aiohttp.ClientTimeout(
+            total=TIMEOUT_TOTAL,
+            connect=TIMEOUT_CONNECT,
+            sock_read=TIMEOUT_SOCK_READ,
+        ),
+        connector=connector,
+    )
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+        Zwraca wspoldzielona ClientSession dla biezacej petli zdarzen.
+
+        Sesja (i jej pula polaczen keep-alive, cache DNS, kontekst TLS) zyje do
+        close_session(), wiec kolejne paczki i kolejne uruchomienia w tej samej
+        petli korzystaja z juz nawiazanych polaczen. Nie zamykac jej przez
+        `async with` - uzywac bezposrednio.
+
+        :return: Wspoldzielona sesja
+            :rtype: aiohttp.ClientSession
+    """
+    import asyncio
+
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+
+    if session is None or session.closed:
+        session = _sessions[loop] = create_session()
+
+    return session
+
+
+async def close_session() -> None:
+    """
+        Zamyka sesje biezacej petli - wywolac na koncu programu (przed
+        zakonczeniem asyncio.run), inaczej aiohttp ostrzega o niezamknietej sesji.
+    """
+    import asyncio
+
+    session = _sessions.pop(asyncio.get_running_loop(), None)
+    if session is not None and not session.closed:
+        await session.close()
+
+
+def get_sync_session() -> requests.Session:
+    """
+        Wspoldzielona requests.Session dla kodu synchronicznego (np. requests w
+        watkach przez asyncio.to_thread) - pula polaczen keep-alive zamiast
+        nowego polaczenia TCP/TLS przy kazdym requests.get.
+
+        :return: Wspoldzielona sesja
+            :rtype: requests.Session
+    """
+    global _sync_session
+
+    with _sync_lock:
+        if _sync_session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.headers.update(default_headers())
+            adapter = HTTPAdapter(pool_connections=LIMIT, pool_maxsize=LIMIT)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _sync_session = session
+
+    return _sync_session
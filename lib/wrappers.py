@@ -1,6 +1,11 @@
 import time
+import json
 import asyncio
-from typing import Callable
+import itertools
+import threading
+import contextvars
+from collections import OrderedDict, deque
+from typing import Callable, Hashable, Optional
 from functools import wraps
 
 def debugIO(func: Callable) -> Callable:
@@ -81,5 +86,337 @@ def func_timing(func: Callable) -> Callable:
         return sync_wrapper
 
 
+def timed(record: Callable[[str, float], None], name: str = None) -> Callable:
+    """
+    Like func_timing, but leaves the return value alone and hands the
+    duration to record(name, seconds) instead of printing it - for
+    instrumenting callbacks whose result matters (event handlers, hooks).
+    """
+
+    def decorator(func: Callable) -> Callable:
+
+        label = name or getattr(func, '__qualname__', type(func).__name__)
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                record(label, time.perf_counter() - start)
+
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper
+        else:
+            return sync_wrapper
+
+    return decorator
+
+
+def _consume_exception(task: "asyncio.Task") -> None:
+    if not task.cancelled():
+        task.exception()
+
+
+def _default_key(*args, **kwargs) -> Hashable:
+    return (args, tuple(sorted(kwargs.items()))) if kwargs else args
+
+
+class _Flight:
+    """Result of one call that duplicate calls from other threads wait for"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+def memoize(func: Callable = None, *, maxsize: int = 128, ttl: float = None, key: Callable = None) -> Callable:
+    """
+    Result cache for sync and async functions: LRU of maxsize entries, with an
+    optional time to live (ttl, seconds). key(*args, **kwargs) computes the
+    cache key (default: the arguments). Concurrent calls with the same key
+    share one execution (single-flight), also across threads
+    (asyncio.to_thread). Exceptions are not cached.
+
+    Usage: @memoize or @memoize(maxsize=1000, ttl=600, key=lambda url, **kw: url)
+    Stats: fn.cache_info() -> {'hits', 'misses', 'coalesced', 'size'}, fn.cache_clear()
+    """
+
+    def decorator(func: Callable) -> Callable:
+
+        make_key = key or _default_key
+        lock = threading.Lock()
+        cache: OrderedDict = OrderedDict()
+        in_flight: dict = {}
+        stats = {'hits': 0, 'misses': 0, 'coalesced': 0}
+
+        def lookup(cache_key):
+            # Caller holds lock
+            entry = cache.get(cache_key)
+            if entry is None:
+                return False, None
+            expires, value = entry
+            if expires is not None and expires <= time.monotonic():
+                del cache[cache_key]
+                return False, None
+            cache.move_to_end(cache_key)
+            stats['hits'] += 1
+            return True, value
+
+        def store(cache_key, value):
+            # Caller holds lock
+            cache[cache_key] = (time.monotonic() + ttl if ttl is not None else None, value)
+            cache.move_to_end(cache_key)
+            while len(cache) > maxsize:
+                cache.popitem(last=False)
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+
+            cache_key = make_key(*args, **kwargs)
+            with lock:
+                found, value = lookup(cache_key)
+                if found:
+                    return value
+                flight = in_flight.get(cache_key)
+                leader = flight is None
+                if leader:
+                    flight = in_flight[cache_key] = _Flight()
+                    stats['misses'] += 1
+                else:
+                    stats['coalesced'] += 1
+
+            if not leader:
+                flight.done.wait()
+                if flight.error is not None:
+                    raise flight.error
+                return flight.result
+
+            try:
+                flight.result = func(*args, **kwargs)
+                with lock:
+                    store(cache_key, flight.result)
+                return flight.result
+            except BaseException as e:
+                flight.error = e
+                raise
+            finally:
+                with lock:
+                    in_flight.pop(cache_key, None)
+                flight.done.set()
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+
+            cache_key = make_key(*args, **kwargs)
+            loop = asyncio.get_running_loop()
+
+            with lock:
+                found, value = lookup(cache_key)
+                if found:
+                    return value
+                flight = in_flight.get(cache_key)
+                # A task of another event loop cannot be awaited - compute separately
+                if flight is not None and flight.get_loop() is loop:
+                    stats['coalesced'] += 1
+                else:
+                    stats['misses'] += 1
+
+                    async def run():
+                        try:
+                            result = await func(*args, **kwargs)
+                            with lock:
+                                store(cache_key, result)
+                            return result
+                        finally:
+                            with lock:
+                                if in_flight.get(cache_key) is task:
+                                    del in_flight[cache_key]
+
+                    flight = task = loop.create_task(run())
+                    # If every waiter was cancelled nobody awaits the task:
+                    # retrieve its exception so asyncio does not log it as lost
+                    task.add_done_callback(_consume_exception)
+                    in_flight[cache_key] = task
+
+            # shield: cancelling one waiter does not cancel the shared call
+            return await asyncio.shield(flight)
+
+        def cache_info() -> dict:
+            with lock:
+                return {**stats, 'size': len(cache)}
+
+        def cache_clear() -> None:
+            with lock:
+                cache.clear()
+                for name in stats:
+                    stats[name] = 0
+
+        wrapper = async_wrapper if asyncio.iscoroutinefunction(func) else sync_wrapper
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+# Tracing: spans recorded into a ring buffer, exported as Chrome trace events.
+# The parent span travels in a ContextVar, so it follows asyncio tasks and
+# asyncio.to_thread (both copy the context); plain executors need in_context().
+
+_trace_parent: contextvars.ContextVar = contextvars.ContextVar('trace_parent', default=None)
+_trace_buffer: Optional[deque] = None
+_span_ids = itertools.count(1)
+
+
+def start_tracing(capacity: int = 200_000) -> None:
+    """Start recording spans; the oldest are dropped beyond capacity"""
+    global _trace_buffer
+    _trace_buffer = deque(maxlen=capacity)
+
+
+def stop_tracing() -> list:
+    """Stop recording and return the recorded spans"""
+    global _trace_buffer
+    spans, _trace_buffer = list(_trace_buffer or ()), None
+    return spans
+
+
+def _lane() -> tuple:
+    """Timeline row of the caller: its asyncio task, else its thread"""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return ('task', id(task)), task.get_name()
+    thread = threading.current_thread()
+    return ('thread', thread.ident), thread.name
+
+
+class span:
+    """Record the enclosed block as a span nested under the current one
+
+    A plain class rather than @contextmanager: spans wrap hot paths, and this
+    keeps a recorded span at a couple of microseconds.
+    """
+    __slots__ = ('name', 'args', 'buffer', 'span_id', 'parent_id', 'token', 'lane', 'lane_name', 'start')
+
+    def __init__(self, name: str, **args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.buffer = _trace_buffer
+        if self.buffer is None:
+            return self
+        self.span_id = next(_span_ids)
+        self.parent_id = _trace_parent.get()
+        self.token = _trace_parent.set(self.span_id)
+        self.lane, self.lane_name = _lane()
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        if self.buffer is None:
+            return False
+        end = time.perf_counter_ns()
+        _trace_parent.reset(self.token)
+        # deque.append is atomic - safe from threads and tasks alike
+        self.buffer.append((self.name, self.start, end - self.start, self.span_id, self.parent_id,
+                            self.lane, self.lane_name, self.args))
+        return False
+
+
+def traced(func: Callable = None, *, name: str = None) -> Callable:
+    """Decorator: every call of func becomes a span (sync or async)"""
+
+    def decorator(func: Callable) -> Callable:
+
+        label = name or func.__qualname__
+
+        @wraps(func)
+        def sync_wrapper(*args, **kwargs):
+            with span(label):
+                return func(*args, **kwargs)
+
+        @wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            with span(label):
+                return await func(*args, **kwargs)
+
+        if asyncio.iscoroutinefunction(func):
+            return async_wrapper
+        else:
+            return sync_wrapper
+
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def in_context(func: Callable) -> Callable:
+    """Bind func to the caller's context, for loop.run_in_executor / executor.submit"""
+    context = contextvars.copy_context()
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        return context.run(func, *args, **kwargs)
+
+    return wrapper
+
+
+def export_chrome_trace(path: str, spans: list = None) -> int:
+    """
+    Write spans (default: the current buffer) as Chrome trace-event JSON,
+    viewable in Perfetto / chrome://tracing. Each asyncio task and thread is
+    its own row; a flow arrow links a span to a parent on another row.
+    Returns the number of spans written.
+    """
+    spans = list(_trace_buffer or ()) if spans is None else spans
+    lanes: dict = {}
+    by_id = {}
+    events = []
+
+    for name, start, duration, span_id, parent_id, lane, lane_name, args in spans:
+        tid = lanes.setdefault(lane, (len(lanes) + 1, lane_name))[0]
+        by_id[span_id] = (tid, start)
+        events.append({
+            'name': name, 'cat': 'span', 'ph': 'X', 'pid': 1, 'tid': tid,
+            'ts': start / 1000, 'dur': duration / 1000,
+            'args': {'span_id': span_id, 'parent_id': parent_id, **{k: str(v) for k, v in args.items()}},
+        })
+
+    for name, start, _, span_id, parent_id, lane, _, _ in spans:
+        parent = by_id.get(parent_id)
+        if parent is not None and parent[0] != lanes[lane][0]:
+            events.append({'name': 'handoff', 'cat': 'flow', 'ph': 's', 'id': span_id,
+                           'pid': 1, 'tid': parent[0], 'ts': parent[1] / 1000})
+            events.append({'name': 'handoff', 'cat': 'flow', 'ph': 'f', 'bp': 'e', 'id': span_id,
+                           'pid': 1, 'tid': lanes[lane][0], 'ts': start / 1000})
+
+    for tid, lane_name in lanes.values():
+        events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                       'args': {'name': lane_name}})
+
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    return len(spans)
+
+
 # python -m venv .venv
 # source .venv/Scripts/activate
\ No newline at end of file
@@ -1,11 +1,179 @@
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
+from tkinter import font as tkfont
 from datetime import datetime
+from collections import deque
+from functools import lru_cache
 import math
+import os
+import queue
+import time
+
+from history import COLUMNS, HistoryLoader, HistoryQuery, VirtualList
+from importer import ImportJob
+from store import OrderStore, missing_fields
+from suggest import Suggestions
+from sync import SYNC_URL, SyncClient
+
+
+class AnimationScheduler:
+    """Single frame clock for every canvas animation in the app
+
+    Animations are callables run once per frame. The frame rate is capped at
+    `fps` and stretched adaptively when frames get expensive, so animations
+    never take more than `max_load` of the main loop. The clock is suspended
+    while the window is minimized or unfocused, and `low_power` stops it
+    entirely. One-shot redraws (hover effects) are coalesced via request().
+    """
+    def __init__(self, root, fps=20, max_load=0.3, low_power=False):
+        self.root = root
+        self.fps = fps
+        self.max_load = max_load
+        self.low_power = low_power
+
+        self.animations = []
+        self.pending = {}
+        self.paused = False
+        self.frame_cost = 0.0
+        self.frames = 0
+        self.dropped_frames = 0
+
+        self._tick_id = None
+        self._flush_id = None
+
+        self.root.bind('<Unmap>', self.on_unmap, add='+')
+        self.root.bind('<Map>', self.on_map, add='+')
+        self.root.bind('<FocusOut>', self.on_focus_out, add='+')
+        self.root.bind('<FocusIn>', self.on_focus_in, add='+')
+
+    @property
+    def running(self):
+        return not self.paused and not self.low_power
+
+    def interval_ms(self):
+        """Frame interval: the FPS cap, or longer if frames exceed the load budget"""
+        base = 1000 / self.fps
+        return max(base, self.frame_cost * 1000 / self.max_load)
+
+    def add(self, animation):
+        self.animations.append(animation)
+        self.schedule()
+
+    def remove(self, animation):
+        if animation in self.animations:
+            self.animations.remove(animation)
+
+    def request(self, key, callback):
+        """Run callback once on the next idle cycle; repeated requests for a key coalesce"""
+        self.pending[key] = callback
+        if self._flush_id is None:
+            self._flush_id = self.root.after_idle(self.flush)
+
+    def flush(self):
+        self._flush_id = None
+        pending, self.pending = self.pending, {}
+        for callback in pending.values():
+            try:
+                callback()
+            except tk.TclError:
+                # Widget destroyed before the idle cycle (e.g. screen switched)
+                pass
+
+    def schedule(self):
+        if self._tick_id is None and self.running and self.animations:
+            self._tick_id = self.root.after(int(self.interval_ms()), self.tick)
+
+    def cancel(self):
+        if self._tick_id is not None:
+            self.root.after_cancel(self._tick_id)
+            self._tick_id = None
+
+    def tick(self):
+        self._tick_id = None
+        if not self.running:
+            return
+
+        start = time.perf_counter()
+        for animation in list(self.animations):
+            animation()
+        cost = time.perf_counter() - start
+
+        # Exponential moving average keeps one slow frame from halving the FPS
+        self.frame_cost = 0.8 * self.frame_cost + 0.2 * cost
+        self.frames += 1
+        skipped = int(self.interval_ms() * self.fps / 1000) - 1
+        self.dropped_frames += max(0, skipped)
+
+        self.schedule()
+
+    def set_low_power(self, enabled):
+        self.low_power = enabled
+        if enabled:
+            self.cancel()
+        else:
+            self.schedule()
+
+    def pause(self):
+        self.paused = True
+        self.cancel()
+
+    def resume(self):
+        self.paused = False
+        self.schedule()
+
+    def on_unmap(self, e):
+        if e.widget is self.root:
+            self.pause()
+
+    def on_map(self, e):
+        if e.widget is self.root:
+            self.resume()
+
+    def on_focus_out(self, e):
+        # FocusOut also fires when focus moves between our own widgets - check once it settles
+        self.root.after(200, self.check_focus)
+
+    def on_focus_in(self, e):
+        if self.paused and self.root.state() != 'iconic':
+            self.resume()
+
+    def check_focus(self):
+        try:
+            focused = self.root.focus_displayof()
+        except (KeyError, tk.TclError):
+            focused = None
+        if focused is None:
+            self.pause()
+
+
+# Fonts and colour variants are shared by every widget instance
+_fonts = {}
+
+
+def shared_font(family, size, weight='normal'):
+    key = (family, size, weight)
+    if key not in _fonts:
+        _fonts[key] = tkfont.Font(family=family, size=size, weight=weight)
+    return _fonts[key]
+
+
+@lru_cache(maxsize=None)
+def shade(color, factor):
+    """Darken (factor < 1) or lighten (factor > 1) a #rrggbb colour"""
+    r, g, b = (int(color[i:i + 2], 16) for i in (1, 3, 5))
+    return '#' + ''.join(f'{min(255, int(c * factor)):02x}' for c in (r, g, b))
 
 
 class ModernButton(tk.Canvas):
-    """Custom button with hover effects and gradients"""
+    """Custom button with hover effects and gradients
+
+    Canvas items are created once; hover, pressed and disabled states are
+    applied by diffing against the rendered state with itemconfig()/move().
+    """
+    DISABLED_BG = '#334155'
+    DISABLED_FG = '#94a3b8'
+    REST_OFFSET = 4
+
     def __init__(self, parent, text, command, bg_color, hover_color, **kwargs):
         self.width = kwargs.get('width', 280)
         self.height = kwargs.get('height', 80)
@@ -17,83 +185,230 @@ class ModernButton(tk.Canvas):
         self.bg_color = bg_color
         self.hover_color = hover_color
         self.is_hovered = False
+        self.is_pressed = False
+        self.is_disabled = False
+        self.scheduler = kwargs.get('scheduler')
+
+        # (bg fill, text fill, vertical offset) currently on the canvas
+        self.rendered = None
         
+        self.create_items()
         self.draw_button()
         
         self.bind('<Enter>', self.on_enter)
         self.bind('<Leave>', self.on_leave)
         self.bind('<Button-1>', self.on_click)
-        
-    def draw_button(self):
-        self.delete('all')
-        color = self.hover_color if self.is_hovered else self.bg_color
-        
+        self.bind('<ButtonRelease-1>', self.on_release)
+
+    def create_items(self):
         # Shadow
-        shadow_offset = 0 if self.is_hovered else 4
-        self.create_rectangle(5, 5 + shadow_offset, self.width - 5, self.height - 5 + shadow_offset,
+        self.create_rectangle(5, 5, self.width - 5, self.height - 5,
                             fill='#000000', outline='', tags='shadow')
         
         # Button background with rounded corners effect
-        self.create_rectangle(0, shadow_offset, self.width - 10, self.height - 10 + shadow_offset,
-                            fill=color, outline='', tags='bg')
+        self.create_rectangle(0, 0, self.width - 10, self.height - 10,
+                            fill=self.bg_color, outline='', tags='bg')
         
         # Shine effect
-        self.create_rectangle(5, 5 + shadow_offset, self.width - 15, 25 + shadow_offset,
+        self.create_rectangle(5, 5, self.width - 15, 25,
                             fill='#ffffff', outline='', stipple='gray25', tags='shine')
         
         # Text
-        self.create_text(self.width // 2 - 5, self.height // 2 - 5 + shadow_offset,
+        self.create_text(self.width // 2 - 5, self.height // 2 - 5,
                         text=self.text, fill='white', 
-                        font=('Segoe UI', 14, 'bold'), tags='text')
+                        font=shared_font('Segoe UI', 14, 'bold'), tags='text')
+
+        self.rendered = (self.bg_color, 'white', 0)
+
+    def look(self):
+        if self.is_disabled:
+            return self.DISABLED_BG, self.DISABLED_FG, self.REST_OFFSET
+        if self.is_pressed:
+            return shade(self.hover_color, 0.8), 'white', 0
+        if self.is_hovered:
+            return self.hover_color, 'white', 0
+        return self.bg_color, 'white', self.REST_OFFSET
+        
+    def draw_button(self):
+        fill, text_fill, offset = self.look()
+        old_fill, old_text_fill, old_offset = self.rendered
+
+        if fill != old_fill:
+            self.itemconfig('bg', fill=fill)
+        if text_fill != old_text_fill:
+            self.itemconfig('text', fill=text_fill)
+        if offset != old_offset:
+            self.move('all', 0, offset - old_offset)
+
+        self.rendered = (fill, text_fill, offset)
     
+    def redraw(self):
+        if self.scheduler is not None:
+            self.scheduler.request(self, self.draw_button)
+        else:
+            self.draw_button()
+
+    def set_enabled(self, enabled):
+        self.is_disabled = not enabled
+        self.config(cursor='hand2' if enabled and self.is_hovered else '')
+        self.redraw()
+
     def on_enter(self, e):
         self.is_hovered = True
-        self.draw_button()
-        self.config(cursor='hand2')
+        self.redraw()
+        if not self.is_disabled:
+            self.config(cursor='hand2')
         
     def on_leave(self, e):
         self.is_hovered = False
-        self.draw_button()
+        self.is_pressed = False
+        self.redraw()
         self.config(cursor='')
         
     def on_click(self, e):
+        if self.is_disabled:
+            return
+        self.is_pressed = True
+        self.redraw()
         if self.command:
             self.command()
 
+        # Command switched the screen: this button is hidden now and will not
+        # get <Leave>/<ButtonRelease-1>, so return it to rest for the next visit
+        if not self.winfo_viewable():
+            self.is_hovered = False
+            self.is_pressed = False
+            self.config(cursor='')
+            self.redraw()
 
-class ModernEntry(tk.Frame):
-    """Custom entry with floating label"""
-    def __init__(self, parent, label_text, **kwargs):
+    def on_release(self, e):
+        if self.is_pressed:
+            self.is_pressed = False
+            self.redraw()
+
+
+class ModernField(tk.Frame):
+    """Shared look of ModernEntry / ModernTextArea: border + floating label
+
+    Focus changes only touch the two widgets whose colour differs, and only
+    when the focus state actually changes.
+    """
+    BORDER = '#2d4a7c'
+    BORDER_FOCUS = '#4a9eff'
+    LABEL_FG = '#7e9bc9'
+    LABEL_FG_FOCUS = '#4a9eff'
+
+    def __init__(self, parent, label_text):
         super().__init__(parent, bg='#0a0e27')
         self.label_text = label_text
+        self.focused = False
         
-        # Container for the entry with gradient-like border
-        self.border_frame = tk.Frame(self, bg='#2d4a7c', bd=0)
+        # Container with gradient-like border
+        self.border_frame = tk.Frame(self, bg=self.BORDER, bd=0)
         self.border_frame.pack(fill=tk.BOTH, padx=2, pady=2)
         
         # Label
         self.label = tk.Label(self.border_frame, text=label_text, 
-                             font=('Segoe UI', 9), bg='#0a0e27', fg='#7e9bc9')
+                             font=shared_font('Segoe UI', 9), bg='#0a0e27', fg=self.LABEL_FG)
         self.label.pack(anchor=tk.W, padx=10, pady=(8, 0))
+
+    def bind_focus(self, widget):
+        # Bind focus events for animation
+        widget.bind('<FocusIn>', self.on_focus_in)
+        widget.bind('<FocusOut>', self.on_focus_out)
+
+    def set_focused(self, focused):
+        if focused == self.focused:
+            return
+        self.focused = focused
+        self.border_frame.config(bg=self.BORDER_FOCUS if focused else self.BORDER)
+        self.label.config(fg=self.LABEL_FG_FOCUS if focused else self.LABEL_FG)
+        
+    def on_focus_in(self, e):
+        self.set_focused(True)
+        
+    def on_focus_out(self, e):
+        self.set_focused(False)
+
+
+class ModernEntry(ModernField):
+    """Custom entry with floating label
+
+    With suggest=<PrefixIndex> typing opens a dropdown of completions
+    (Up/Down to pick, Enter/Tab to accept, Escape to close).
+    """
+    SUGGESTIONS = 6
+
+    def __init__(self, parent, label_text, **kwargs):
+        super().__init__(parent, label_text)
         
         # Entry
-        self.entry = tk.Entry(self.border_frame, font=('Segoe UI', 11), 
+        self.entry = tk.Entry(self.border_frame, font=shared_font('Segoe UI', 11), 
                              bg='#0a0e27', fg='#ffffff', 
                              insertbackground='#4a9eff', bd=0,
                              relief=tk.FLAT)
         self.entry.pack(fill=tk.X, padx=10, pady=(0, 8))
-        
-        # Bind focus events for animation
-        self.entry.bind('<FocusIn>', self.on_focus_in)
-        self.entry.bind('<FocusOut>', self.on_focus_out)
-        
-    def on_focus_in(self, e):
-        self.border_frame.config(bg='#4a9eff')
-        self.label.config(fg='#4a9eff')
-        
-    def on_focus_out(self, e):
-        self.border_frame.config(bg='#2d4a7c')
-        self.label.config(fg='#7e9bc9')
+        self.bind_focus(self.entry)
+
+        self.suggest = kwargs.get('suggest')
+        self.dropdown = None
+        if self.suggest is not None:
+            self.entry.bind('<KeyRelease>', self.on_key_release, add='+')
+            self.entry.bind('<Down>', lambda e: self.move_selection(1))
+            self.entry.bind('<Up>', lambda e: self.move_selection(-1))
+            self.entry.bind('<Return>', self.accept_suggestion)
+            self.entry.bind('<Tab>', self.accept_suggestion)
+            self.entry.bind('<Escape>', lambda e: self.hide_suggestions())
+            self.entry.bind('<FocusOut>', lambda e: self.after(150, self.hide_suggestions), add='+')
+
+    def on_key_release(self, e):
+        if e.keysym in ('Up', 'Down', 'Return', 'Tab', 'Escape'):
+            return
+        matches = self.suggest.complete(self.get(), self.SUGGESTIONS)
+        if not matches or matches == [self.get()]:
+            self.hide_suggestions()
+            return
+
+        if self.dropdown is None:
+            # Child of the toplevel so it can overlap the fields below
+            self.dropdown = tk.Listbox(self.winfo_toplevel(), font=shared_font('Segoe UI', 10),
+                                       bg='#11163a', fg='#ffffff', selectbackground='#2563eb',
+                                       highlightthickness=1, highlightbackground=self.BORDER_FOCUS,
+                                       bd=0, activestyle='none')
+            self.dropdown.bind('<ButtonRelease-1>', self.accept_suggestion)
+        self.dropdown.delete(0, tk.END)
+        self.dropdown.insert(tk.END, *matches)
+        self.dropdown.config(height=len(matches))
+        self.dropdown.place(in_=self, relx=0, rely=1, relwidth=1)
+        self.dropdown.lift()
+
+    def move_selection(self, step):
+        if not self.dropdown or not self.dropdown.winfo_ismapped():
+            return
+        current = self.dropdown.curselection()
+        index = (current[0] + step) if current else (0 if step > 0 else self.dropdown.size() - 1)
+        index = max(0, min(index, self.dropdown.size() - 1))
+        self.dropdown.selection_clear(0, tk.END)
+        self.dropdown.selection_set(index)
+        self.dropdown.see(index)
+        return 'break'
+
+    def accept_suggestion(self, e):
+        if not self.dropdown or not self.dropdown.winfo_ismapped():
+            return
+        current = self.dropdown.curselection()
+        if not current:
+            self.hide_suggestions()
+            return
+        self.set(self.dropdown.get(current[0]))
+        self.entry.icursor(tk.END)
+        self.entry.focus_set()
+        self.hide_suggestions()
+        return 'break'
+
+    def hide_suggestions(self):
+        if self.dropdown is not None:
+            self.dropdown.place_forget()
         
     def get(self):
         return self.entry.get()
@@ -101,84 +416,180 @@ class ModernEntry(tk.Frame):
     def insert(self, index, text):
         self.entry.insert(index, text)
 
+    def set(self, text):
+        self.entry.delete(0, tk.END)
+        self.entry.insert(0, text)
+
 
-class ModernTextArea(tk.Frame):
+class ModernTextArea(ModernField):
     """Custom text area with floating label"""
     def __init__(self, parent, label_text, **kwargs):
-        super().__init__(parent, bg='#0a0e27')
-        self.label_text = label_text
-        
-        # Container
-        self.border_frame = tk.Frame(self, bg='#2d4a7c', bd=0)
-        self.border_frame.pack(fill=tk.BOTH, padx=2, pady=2)
-        
-        # Label
-        self.label = tk.Label(self.border_frame, text=label_text, 
-                             font=('Segoe UI', 9), bg='#0a0e27', fg='#7e9bc9')
-        self.label.pack(anchor=tk.W, padx=10, pady=(8, 0))
+        super().__init__(parent, label_text)
         
         # Text widget
-        self.text = tk.Text(self.border_frame, font=('Segoe UI', 10), 
+        self.text = tk.Text(self.border_frame, font=shared_font('Segoe UI', 10), 
                            bg='#0a0e27', fg='#ffffff', 
                            insertbackground='#4a9eff', bd=0,
                            relief=tk.FLAT, height=4, wrap=tk.WORD)
         self.text.pack(fill=tk.BOTH, padx=10, pady=(0, 8))
-        
-        # Bind focus events
-        self.text.bind('<FocusIn>', self.on_focus_in)
-        self.text.bind('<FocusOut>', self.on_focus_out)
-        
-    def on_focus_in(self, e):
-        self.border_frame.config(bg='#4a9eff')
-        self.label.config(fg='#4a9eff')
-        
-    def on_focus_out(self, e):
-        self.border_frame.config(bg='#2d4a7c')
-        self.label.config(fg='#7e9bc9')
+        self.bind_focus(self.text)
         
     def get(self, start, end):
         return self.text.get(start, end)
 
+    def set(self, text):
+        self.text.delete('1.0', tk.END)
+        self.text.insert('1.0', text)
+
 
 class AnimatedBackground(tk.Canvas):
-    """Animated gradient background"""
+    """Animated gradient background
+
+    The gradient is rendered once into a cached PhotoImage (re-rendered only on
+    resize) and the particles are persistent canvas items moved with coords(),
+    so a frame costs 15 coords() calls instead of ~600 item allocations.
+    """
+    PARTICLE_COUNT = 15
+    PARTICLE_COLORS = ['#4a9eff', '#7e9bc9', '#2d4a7c']
+
     def __init__(self, parent, **kwargs):
         super().__init__(parent, highlightthickness=0, **kwargs)
         self.colors = ['#0a0e27', '#1a1e47', '#0a0e27']
         self.current_color_index = 0
         self.animation_step = 0
-        
-    def animate(self):
+
+        self.gradient_image = None
+        self.gradient_item = None
+        self.gradient_size = (0, 0)
+        self.particles = []
+
+        # Last frame durations in seconds, for profiling
+        self.frame_times = deque(maxlen=200)
+
+        self.bind('<Configure>', self.on_resize)
+
+    def on_resize(self, e):
+        self.render_gradient(e.width, e.height)
+
+    def render_gradient(self, width, height):
+        """Render the vertical gradient into a cached image (no-op if size unchanged)"""
+        if (width, height) == self.gradient_size or width <= 1 or height <= 1:
+            return
+
+        # One pixel wide column, then stretched horizontally by Tk
+        rows = []
+        for i in range(height):
+            ratio = i / height
+            # Interpolate between dark blues
+            r = int(10 + ratio * 10)
+            g = int(14 + ratio * 16)
+            b = int(39 + ratio * 32)
+            rows.append(f'{{#{r:02x}{g:02x}{b:02x}}}')
+
+        column = tk.PhotoImage(width=1, height=height)
+        column.put(' '.join(rows))
+        self.gradient_image = column.zoom(width, 1)
+
+        if self.gradient_item is None:
+            self.gradient_item = self.create_image(0, 0, anchor=tk.NW,
+                                                   image=self.gradient_image, tags='gradient')
+            self.tag_lower(self.gradient_item)
+        else:
+            self.itemconfig(self.gradient_item, image=self.gradient_image)
+
+        self.gradient_size = (width, height)
+
+    def draw_frame(self):
+        start = time.perf_counter()
+
         # Create subtle color shift animation
         self.animation_step = (self.animation_step + 1) % 100
-        
-        # Draw gradient background
-        self.delete('all')
+
         height = self.winfo_height()
         width = self.winfo_width()
-        
+
         if height > 1 and width > 1:
-            # Create vertical gradient
-            for i in range(height):
-                ratio = i / height
-                # Interpolate between dark blues
-                r = int(10 + ratio * 10)
-                g = int(14 + ratio * 16)
-                b = int(39 + ratio * 32)
-                color = f'#{r:02x}{g:02x}{b:02x}'
-                self.create_line(0, i, width, i, fill=color, tags='gradient')
-            
-            # Add some subtle animated particles
-            for j in range(15):
+            self.render_gradient(width, height)
+
+            if not self.particles:
+                for j in range(self.PARTICLE_COUNT):
+                    self.particles.append(self.create_oval(
+                        0, 0, 0, 0, fill=self.PARTICLE_COLORS[j % 3], outline='', tags='particle'))
+
+            # Move the subtle animated particles
+            for j, particle in enumerate(self.particles):
                 offset = (self.animation_step + j * 7) % 100
-                x = (width * j / 15 + offset * 2) % width
+                x = (width * j / self.PARTICLE_COUNT + offset * 2) % width
                 y = (height * ((j * 17) % 100) / 100)
                 size = 2 + (j % 3)
-                opacity = ['#4a9eff', '#7e9bc9', '#2d4a7c'][j % 3]
-                self.create_oval(x, y, x + size, y + size, 
-                               fill=opacity, outline='', tags='particle')
-        
-        self.after(50, self.animate)
+                self.coords(particle, x, y, x + size, y + size)
+
+        self.frame_times.append(time.perf_counter() - start)
+
+    def set_particles_visible(self, visible):
+        self.itemconfig('particle', state=tk.NORMAL if visible else tk.HIDDEN)
+
+
+class Screen:
+    """A screen built once: its root-level widgets and where they are placed"""
+    def __init__(self, on_show=None):
+        self.placements = []
+        self.on_show = on_show
+
+    def add(self, widget, **place):
+        self.placements.append((widget, place))
+        return widget
+
+    def show(self):
+        if self.on_show:
+            self.on_show()
+        for widget, place in self.placements:
+            widget.place(**place)
+
+    def hide(self):
+        for widget, _ in self.placements:
+            widget.place_forget()
+
+
+class ViewManager:
+    """Builds each screen lazily on first visit and switches by (un)mapping
+
+    Screens stay alive between visits, so navigation costs no widget
+    construction; per-visit state is reset through Screen.on_show.
+    """
+    def __init__(self, root):
+        self.root = root
+        self.builders = {}
+        self.screens = {}
+        self.current = None
+
+    def register(self, name, builder):
+        self.builders[name] = builder
+
+    def get(self, name):
+        if name not in self.screens:
+            self.screens[name] = self.builders[name]()
+        return self.screens[name]
+
+    def show(self, name):
+        screen = self.get(name)
+        if self.current is not None and self.current is not screen:
+            self.current.hide()
+        screen.show()
+        self.current = screen
+
+    def prewarm(self, names):
+        """Build the given screens one per idle cycle, without blocking input"""
+        pending = [n for n in names if n not in self.screens]
+        if not pending:
+            return
+
+        def build_next():
+            self.get(pending.pop(0))
+            if pending:
+                self.root.after_idle(lambda: self.root.after(1, build_next))
+
+        self.root.after_idle(build_next)
 
 
 class DeliveryApp:
@@ -189,19 +600,113 @@ class DeliveryApp:
         self.root.resizable(False, False)
         self.root.configure(bg='#0a0e27')
         
+        # Event-loop lag monitor; installed before any callback is registered
+        # so every handler gets timed (F12: overlay, Ctrl+Shift+D: dump)
+        self.monitor = None
+        if os.environ.get('PYAPP_PROFILE') == '1':
+            # Imported only when profiling, so normal runs never touch tkinter.CallWrapper
+            from lag_monitor import LagMonitor
+            self.monitor = LagMonitor(self.root).install()
+            self.monitor.watch(self, 'save_delivery', 'save_transfer')
+        
         # Center window
         self.center_window()
         
+        # Local order store; writes happen on a background thread
+        self.store = OrderStore()
+        self.root.protocol('WM_DELETE_WINDOW', self.on_close)
+        self.store_label = tk.Label(self.root, text='', font=('Segoe UI', 8),
+                                    bg='#0a0e27', fg='#ef4444')
+        
+        # Autocomplete of suppliers and locations, loaded in the background
+        self.suggestions = Suggestions(self.store)
+        self.suggestions.load()
+        
+        # Frame clock shared by all animations
+        self.scheduler = AnimationScheduler(
+            self.root, fps=20, low_power=os.environ.get('PYAPP_LOW_POWER') == '1')
+        
         # Create animated background
         self.bg_canvas = AnimatedBackground(self.root, bg='#0a0e27')
         self.bg_canvas.place(x=0, y=0, relwidth=1, relheight=1)
         
         # Start animation
-        self.root.after(100, lambda: self.bg_canvas.animate())
+        if self.monitor:
+            self.monitor.watch(self.bg_canvas, 'draw_frame')
+        self.scheduler.add(self.bg_canvas.draw_frame)
+        self.root.bind('<Control-l>', lambda e: self.toggle_low_power())
+        
+        # Screens are built on first visit and kept
+        self.views = ViewManager(self.root)
+        self.views.register('menu', self.build_main_menu)
+        self.views.register('delivery', self.build_delivery_form)
+        self.views.register('transfer', self.build_transfer_form)
+        self.views.register('history', self.build_history)
+        
+        # Outbound sync to the central system (only when configured)
+        self.sync = None
+        if SYNC_URL:
+            self.sync = SyncClient(self.store.path).start()
+            self.store.listeners.append(self.sync.wake)
+            self.sync_label = tk.Label(self.root, text='', font=('Segoe UI', 8), bg='#0a0e27')
+            self.sync_label.place(relx=1.0, rely=1.0, x=-10, y=-10, anchor=tk.SE)
+            self.poll_sync()
         
         # Show main menu
         self.show_main_menu()
+        self.views.prewarm(['delivery', 'transfer'])
+        self.poll_store()
     
+    def on_close(self):
+        if self.sync:
+            self.sync.stop()
+        if self.monitor:
+            print(self.monitor.report())
+            self.monitor.uninstall()
+        # Let the writer finish the pending batch before the process exits
+        self.store.close()
+        if self.store.unsaved:
+            messagebox.showerror(
+                "Błąd zapisu",
+                f"{self.store.unsaved} zamówień nie zostało zapisanych:\n{self.store.last_error}")
+        self.root.destroy()
+
+    def poll_store(self):
+        """Show failed local writes; the store keeps retrying them"""
+        if self.store.unsaved:
+            text = f'● Błąd zapisu – {self.store.unsaved} zamówień czeka na ponowienie'
+            if self.store_label.cget('text') != text:
+                self.store_label.config(text=text)
+                self.store_label.place(relx=0.0, rely=1.0, x=10, y=-10, anchor=tk.SW)
+        elif self.store_label.cget('text'):
+            self.store_label.config(text='')
+            self.store_label.place_forget()
+        self.root.after(1000, self.poll_store)
+
+    SYNC_LOOK = {
+        'starting': ('#7e9bc9', '● Synchronizacja…'),
+        'synced': ('#10b981', '● Zsynchronizowano {time}'),
+        'syncing': ('#4a9eff', '● Wysyłanie… ({pending} w kolejce)'),
+        'offline': ('#f59e0b', '● Offline – {pending} w kolejce'),
+        'error': ('#ef4444', '● Błąd synchronizacji – {failed} odrzuconych'),
+        'failed': ('#f59e0b', '● Wysłano wszystko poza {failed} odrzuconymi'),
+    }
+
+    def poll_sync(self):
+        """Show the sync status; only reads the client's status tuple"""
+        status = self.sync.status
+        color, text = self.SYNC_LOOK[status.state]
+        text = text.format(pending=status.pending, failed=status.failed,
+                           time=status.last_sync.strftime('%H:%M') if status.last_sync else '')
+        if self.sync_label.cget('text') != text:
+            self.sync_label.config(text=text, fg=color)
+        self.root.after(1000, self.poll_sync)
+
+    def toggle_low_power(self):
+        """Low-power mode: particles off, no animation frames at all"""
+        self.scheduler.set_low_power(not self.scheduler.low_power)
+        self.bg_canvas.set_particles_visible(not self.scheduler.low_power)
+
     def center_window(self):
         self.root.update_idletasks()
         width = self.root.winfo_width()
@@ -210,19 +715,25 @@ class DeliveryApp:
         y = (self.root.winfo_screenheight() // 2) - (height // 2)
         self.root.geometry(f'{width}x{height}+{x}+{y}')
     
-    def clear_content(self):
-        """Clear content while keeping background"""
-        for widget in self.root.winfo_children():
-            if widget != self.bg_canvas:
-                widget.destroy()
-    
     def show_main_menu(self):
-        """Display main menu with modern design"""
-        self.clear_content()
+        self.views.show('menu')
+
+    def create_delivery(self):
+        self.views.show('delivery')
+
+    def create_transfer(self):
+        self.views.show('transfer')
+
+    def show_history(self):
+        self.views.show('history')
+
+    def build_main_menu(self):
+        """Main menu with modern design"""
+        screen = Screen()
         
         # Main container
-        main_frame = tk.Frame(self.root, bg='#0a0e27')
-        main_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        main_frame = screen.add(tk.Frame(self.root, bg='#0a0e27'),
+                                relx=0.5, rely=0.5, anchor=tk.CENTER)
         
         # Title with glow effect
         title_canvas = tk.Canvas(main_frame, width=500, height=120, 
@@ -261,7 +772,8 @@ class DeliveryApp:
             self.create_delivery,
             bg_color='#2563eb',
             hover_color='#3b82f6',
-            parent_bg='#0a0e27'
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
         )
         delivery_btn.pack(pady=10)
         
@@ -272,23 +784,39 @@ class DeliveryApp:
             self.create_transfer,
             bg_color='#7c3aed',
             hover_color='#8b5cf6',
-            parent_bg='#0a0e27'
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
         )
         transfer_btn.pack(pady=10)
         
+        # History button
+        history_btn = ModernButton(
+            buttons_frame,
+            '🗂  HISTORIA',
+            self.show_history,
+            bg_color='#0f766e',
+            hover_color='#14b8a6',
+            height=60,
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
+        )
+        history_btn.pack(pady=10)
+        
         # Footer
-        footer = tk.Label(self.root, 
-                         text=f'v2.0 • {datetime.now().strftime("%Y")} • System Logistyczny',
-                         font=('Segoe UI', 8), fg='#4a5568', bg='#0a0e27')
-        footer.pack(side=tk.BOTTOM, pady=10)
+        screen.add(tk.Label(self.root, 
+                            text=f'v2.0 • {datetime.now().strftime("%Y")} • System Logistyczny',
+                            font=('Segoe UI', 8), fg='#4a5568', bg='#0a0e27'),
+                   relx=0.5, rely=1.0, y=-10, anchor=tk.S)
+
+        return screen
     
-    def create_delivery(self):
+    def build_delivery_form(self):
         """Form for creating delivery"""
-        self.clear_content()
+        screen = Screen()
         
         # Main container with padding
-        main_frame = tk.Frame(self.root, bg='#0a0e27')
-        main_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        main_frame = screen.add(tk.Frame(self.root, bg='#0a0e27'),
+                                relx=0.5, rely=0.5, anchor=tk.CENTER)
         
         # Header
         header_canvas = tk.Canvas(main_frame, width=600, height=80,
@@ -313,15 +841,21 @@ class DeliveryApp:
         delivery_number = ModernEntry(form_frame, 'Numer dostawy')
         delivery_number.pack(fill=tk.X, pady=8)
         
-        supplier = ModernEntry(form_frame, 'Dostawca')
+        supplier = ModernEntry(form_frame, 'Dostawca', suggest=self.suggestions['supplier'])
         supplier.pack(fill=tk.X, pady=8)
         
         delivery_date = ModernEntry(form_frame, 'Data dostawy')
-        delivery_date.insert(0, datetime.now().strftime("%Y-%m-%d"))
         delivery_date.pack(fill=tk.X, pady=8)
         
         notes = ModernTextArea(form_frame, 'Uwagi')
         notes.pack(fill=tk.X, pady=8)
+
+        def reset():
+            delivery_number.set('')
+            supplier.set('')
+            delivery_date.set(datetime.now().strftime("%Y-%m-%d"))
+            notes.set('')
+        screen.on_show = reset
         
         # Buttons
         button_frame = tk.Frame(main_frame, bg='#0a0e27')
@@ -340,7 +874,8 @@ class DeliveryApp:
             hover_color='#10b981',
             width=130,
             height=50,
-            parent_bg='#0a0e27'
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
         )
         save_btn.pack(side=tk.LEFT, padx=5)
         
@@ -352,17 +887,20 @@ class DeliveryApp:
             hover_color='#94a3b8',
             width=130,
             height=50,
-            parent_bg='#0a0e27'
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
         )
         back_btn.pack(side=tk.LEFT, padx=5)
+
+        return screen
     
-    def create_transfer(self):
+    def build_transfer_form(self):
         """Form for creating transfer order"""
-        self.clear_content()
+        screen = Screen()
         
         # Main container
-        main_frame = tk.Frame(self.root, bg='#0a0e27')
-        main_frame.place(relx=0.5, rely=0.5, anchor=tk.CENTER)
+        main_frame = screen.add(tk.Frame(self.root, bg='#0a0e27'),
+                                relx=0.5, rely=0.5, anchor=tk.CENTER)
         
         # Header
         header_canvas = tk.Canvas(main_frame, width=600, height=80,
@@ -387,15 +925,20 @@ class DeliveryApp:
         transfer_number = ModernEntry(form_frame, 'Numer zlecenia')
         transfer_number.pack(fill=tk.X, pady=8)
         
-        from_location = ModernEntry(form_frame, 'Z lokalizacji')
+        from_location = ModernEntry(form_frame, 'Z lokalizacji', suggest=self.suggestions['location'])
         from_location.pack(fill=tk.X, pady=8)
         
-        to_location = ModernEntry(form_frame, 'Do lokalizacji')
+        to_location = ModernEntry(form_frame, 'Do lokalizacji', suggest=self.suggestions['location'])
         to_location.pack(fill=tk.X, pady=8)
         
         transfer_date = ModernEntry(form_frame, 'Data przeniesienia')
-        transfer_date.insert(0, datetime.now().strftime("%Y-%m-%d"))
         transfer_date.pack(fill=tk.X, pady=8)
+
+        def reset():
+            for field in (transfer_number, from_location, to_location):
+                field.set('')
+            transfer_date.set(datetime.now().strftime("%Y-%m-%d"))
+        screen.on_show = reset
         
         # Buttons
         button_frame = tk.Frame(main_frame, bg='#0a0e27')
@@ -414,7 +957,8 @@ class DeliveryApp:
             hover_color='#10b981',
             width=130,
             height=50,
-            parent_bg='#0a0e27'
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
         )
         save_btn.pack(side=tk.LEFT, padx=5)
         
@@ -426,15 +970,200 @@ class DeliveryApp:
             hover_color='#94a3b8',
             width=130,
             height=50,
-            parent_bg='#0a0e27'
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
         )
         back_btn.pack(side=tk.LEFT, padx=5)
+
+        return screen
+    
+    def build_history(self):
+        """Virtualized list of saved deliveries and transfers"""
+        screen = Screen()
+        state = {'query': HistoryQuery('delivery'), 'search_job': None}
+        
+        # Main container
+        main_frame = screen.add(tk.Frame(self.root, bg='#0a0e27'),
+                                relx=0.5, rely=0.5, anchor=tk.CENTER)
+        
+        # Header
+        header_canvas = tk.Canvas(main_frame, width=640, height=50,
+                                 bg='#0a0e27', highlightthickness=0)
+        header_canvas.pack(pady=(0, 10))
+        header_canvas.create_text(320, 25, text='🗂 HISTORIA',
+                                 font=('Segoe UI', 24, 'bold'),
+                                 fill='#14b8a6')
+        
+        # Controls: kind switch + search
+        controls = tk.Frame(main_frame, bg='#0a0e27')
+        controls.pack(fill=tk.X, pady=(0, 8))
+        
+        # Rows are read by the loader thread on its own connection
+        history = VirtualList(main_frame, HistoryLoader(self.root, self.store.reader),
+                              on_sort=lambda column: sort_by(column), height=288)
+        history.pack(fill=tk.BOTH)
+        
+        def reload(**changes):
+            query = state['query']
+            params = dict(kind=query.kind, search=query.search,
+                          sort=query.sort, descending=query.descending)
+            params.update(changes)
+            state['query'] = HistoryQuery(**params)
+            if state['query'].kind != query.kind or not history.slots:
+                history.set_columns(COLUMNS[state['query'].kind])
+            history.load(state['query'])
+        
+        def sort_by(column):
+            query = state['query']
+            if column == query.sort:
+                reload(descending=not query.descending)
+            else:
+                reload(sort=column, descending=False)
+        
+        def on_search(e):
+            # Debounce: query once typing pauses
+            if state['search_job']:
+                self.root.after_cancel(state['search_job'])
+            state['search_job'] = self.root.after(250, search_now)
+        
+        def search_now():
+            state['search_job'] = None
+            if search.get().strip() != state['query'].search:
+                reload(search=search.get())
+        
+        for kind, label, color, hover in (('delivery', 'Dostawy', '#2563eb', '#3b82f6'),
+                                          ('transfer', 'Przeniesienia', '#7c3aed', '#8b5cf6')):
+            ModernButton(
+                controls,
+                label,
+                lambda k=kind: reload(kind=k),
+                bg_color=color,
+                hover_color=hover,
+                width=140,
+                height=50,
+                parent_bg='#0a0e27',
+                scheduler=self.scheduler
+            ).pack(side=tk.LEFT, padx=(0, 5))
+        
+        search = ModernEntry(controls, 'Szukaj (początek numeru / nazwy)')
+        search.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+        search.entry.bind('<KeyRelease>', on_search)
+        
+        # Saved rows may have arrived since the last visit
+        screen.on_show = lambda: reload()
+        
+        # Buttons + import progress
+        button_frame = tk.Frame(main_frame, bg='#0a0e27')
+        button_frame.pack(fill=tk.X, pady=(8, 0))
+        
+        back_btn = ModernButton(
+            button_frame,
+            '←  POWRÓT',
+            self.show_main_menu,
+            bg_color='#64748b',
+            hover_color='#94a3b8',
+            width=130,
+            height=44,
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
+        )
+        back_btn.pack(side=tk.LEFT, padx=(0, 5))
+        
+        import_btn = ModernButton(
+            button_frame,
+            '⇪  IMPORT',
+            lambda: self.start_import(state['query'].kind, import_btn, cancel_btn, progress,
+                                      progress_label, on_done=lambda: reload()),
+            bg_color='#059669',
+            hover_color='#10b981',
+            width=130,
+            height=44,
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
+        )
+        import_btn.pack(side=tk.LEFT, padx=5)
+        
+        cancel_btn = ModernButton(
+            button_frame,
+            '✕  ANULUJ',
+            None,
+            bg_color='#dc2626',
+            hover_color='#ef4444',
+            width=130,
+            height=44,
+            parent_bg='#0a0e27',
+            scheduler=self.scheduler
+        )
+        cancel_btn.set_enabled(False)
+        cancel_btn.pack(side=tk.LEFT, padx=5)
+        
+        progress = ttk.Progressbar(button_frame, length=200, maximum=1000)
+        progress.pack(side=tk.LEFT, padx=5)
+        progress_label = tk.Label(button_frame, text='', font=('Segoe UI', 9),
+                                  fg='#7e9bc9', bg='#0a0e27', anchor=tk.W)
+        progress_label.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        return screen
     
+    def start_import(self, kind, button, cancel_button, progress, label, on_done):
+        """Import a CSV/JSONL file on a worker thread, polling its progress"""
+        path = filedialog.askopenfilename(
+            title='Import dostaw / przeniesień',
+            filetypes=[('CSV / JSONL', '*.csv *.jsonl *.ndjson'), ('Wszystkie pliki', '*.*')])
+        if not path:
+            return
+
+        job = ImportJob(path, self.store.path, kind).start()
+        button.set_enabled(False)
+        cancel_button.command = job.cancel
+        cancel_button.set_enabled(True)
+        progress['value'] = 0
+
+        def poll():
+            finished = False
+            while True:
+                try:
+                    event = job.events.get_nowait()
+                except queue.Empty:
+                    break
+
+                if event[0] == 'progress':
+                    _, done, total, imported, rejected = event
+                    progress['value'] = 1000 * done / total if total else 1000
+                    label.config(text=f'{imported} zapisanych • {rejected} odrzuconych')
+                elif event[0] in ('done', 'cancelled'):
+                    finished = True
+                    outcome, imported, rejected, report = event
+                    if outcome == 'cancelled':
+                        message = f"Import anulowany.\n\nZapisano przed anulowaniem: {imported}\nOdrzucono: {rejected}"
+                    else:
+                        message = f"✓ Zaimportowano: {imported}\nOdrzucono: {rejected}"
+                    if report:
+                        message += f"\n\nRaport błędów:\n{report}"
+                    messagebox.showinfo("Import", message)
+                else:
+                    finished = True
+                    messagebox.showerror("Błąd", f"Import przerwany:\n{event[1]}")
+
+            if finished:
+                button.set_enabled(True)
+                cancel_button.set_enabled(False)
+                # Imported rows bypass store.listeners
+                self.suggestions.load()
+                on_done()
+            else:
+                self.root.after(100, poll)
+
+        self.root.after(100, poll)
+
     def save_delivery(self, number, supplier, date, notes):
         """Save delivery"""
-        if not number or not supplier:
+        number, supplier = number.strip(), supplier.strip()
+        if missing_fields('delivery', {'number': number, 'supplier': supplier}):
             messagebox.showerror("Błąd", "Wypełnij wszystkie wymagane pola!")
             return
+
+        self.store.add_delivery(number, supplier, date, notes.strip())
         
         messagebox.showinfo(
             "Sukces",
@@ -447,9 +1176,13 @@ class DeliveryApp:
     
     def save_transfer(self, number, from_loc, to_loc, date):
         """Save transfer order"""
-        if not number or not from_loc or not to_loc:
+        number, from_loc, to_loc = number.strip(), from_loc.strip(), to_loc.strip()
+        if missing_fields('transfer', {'number': number, 'from_location': from_loc,
+                                       'to_location': to_loc}):
             messagebox.showerror("Błąd", "Wypełnij wszystkie wymagane pola!")
             return
+
+        self.store.add_transfer(number, from_loc, to_loc, date)
         
         messagebox.showinfo(
             "Sukces",
@@ -0,0 +1,85 @@
+"""Frame time and CPU benchmark for AnimatedBackground
+
+Compares the previous delete-and-recreate renderer with the cached gradient /
+retained particles renderer. Needs a display (or xvfb-run).
+
+    python py-app/bench_background.py --frames 400
+"""
+import argparse
+import time
+import tkinter as tk
+
+from app import AnimatedBackground
+
+
+class LegacyBackground(AnimatedBackground):
+    """Previous renderer: delete('all') + one line per pixel row + 15 ovals per frame"""
+    def draw_frame(self):
+        start = time.perf_counter()
+        self.animation_step = (self.animation_step + 1) % 100
+
+        self.delete('all')
+        height = self.winfo_height()
+        width = self.winfo_width()
+
+        if height > 1 and width > 1:
+            for i in range(height):
+                ratio = i / height
+                r = int(10 + ratio * 10)
+                g = int(14 + ratio * 16)
+                b = int(39 + ratio * 32)
+                self.create_line(0, i, width, i, fill=f'#{r:02x}{g:02x}{b:02x}', tags='gradient')
+
+            for j in range(15):
+                offset = (self.animation_step + j * 7) % 100
+                x = (width * j / 15 + offset * 2) % width
+                y = (height * ((j * 17) % 100) / 100)
+                size = 2 + (j % 3)
+                self.create_oval(x, y, x + size, y + size,
+                                 fill=['#4a9eff', '#7e9bc9', '#2d4a7c'][j % 3], outline='', tags='particle')
+
+        self.frame_times.append(time.perf_counter() - start)
+
+
+def run(cls, frames):
+    root = tk.Tk()
+    root.geometry("700x600")
+    canvas = cls(root, bg='#0a0e27')
+    canvas.place(x=0, y=0, relwidth=1, relheight=1)
+    root.update()
+
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for _ in range(frames):
+        canvas.draw_frame()
+        # Flush the redraw so the Tk rendering cost is included
+        root.update()
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+
+    times = sorted(canvas.frame_times)
+    root.destroy()
+    return {
+        'frame_ms_p50': times[len(times) // 2] * 1000,
+        'frame_ms_p95': times[int(len(times) * 0.95)] * 1000,
+        'cpu_ms_per_frame': cpu / frames * 1000,
+        # Share of one core at the app's 20 FPS (after(50))
+        'cpu_at_20fps': cpu / frames * 20 * 100,
+        'wall_ms_per_frame': wall / frames * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--frames', type=int, default=400)
+    args = parser.parse_args()
+
+    print(f"{'renderer':<10}{'p50 [ms]':>10}{'p95 [ms]':>10}{'CPU/frame [ms]':>16}{'CPU @20fps':>12}")
+    for name, cls in (('legacy', LegacyBackground), ('cached', AnimatedBackground)):
+        r = run(cls, args.frames)
+        print(f"{name:<10}{r['frame_ms_p50']:>10.2f}{r['frame_ms_p95']:>10.2f}"
+              f"{r['cpu_ms_per_frame']:>16.2f}{r['cpu_at_20fps']:>11.1f}%")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,311 @@
+import queue
+import sqlite3
+import threading
+import tkinter as tk
+from array import array
+from collections import OrderedDict
+from tkinter import ttk
+
+
+# kind -> [(column, header, width)]
+COLUMNS = {
+    'delivery': [('number', 'Numer', 150), ('supplier', 'Dostawca', 200),
+                 ('date', 'Data', 110), ('notes', 'Uwagi', 180)],
+    'transfer': [('number', 'Numer', 150), ('from_location', 'Z lokalizacji', 170),
+                 ('to_location', 'Do lokalizacji', 170), ('date', 'Data', 150)],
+}
+TABLE = {'delivery': 'deliveries', 'transfer': 'transfers'}
+
+# Only indexed columns take part in sorting and prefix search
+SORTABLE = {
+    'delivery': ('number', 'supplier', 'date'),
+    'transfer': ('number', 'from_location', 'to_location', 'date'),
+}
+SEARCHABLE = {
+    'delivery': ('number', 'supplier'),
+    'transfer': ('number', 'from_location', 'to_location'),
+}
+
+
+class HistoryQuery:
+    """Filter and sort of the history list, turned into index-friendly SQL
+
+    Search is a prefix match written as a range (col >= ? AND col < ?), which
+    SQLite answers from the column index, unlike LIKE with the default collation.
+    """
+    def __init__(self, kind='delivery', search='', sort='date', descending=True):
+        self.kind = kind
+        self.search = search.strip()
+        self.sort = sort if sort in SORTABLE[kind] else 'date'
+        self.descending = descending
+
+    def ids_sql(self):
+        where, params = '', []
+        if self.search:
+            ranges = [f'({c} >= ? AND {c} < ?)' for c in SEARCHABLE[self.kind]]
+            where = 'WHERE ' + ' OR '.join(ranges)
+            for _ in SEARCHABLE[self.kind]:
+                params += [self.search, self.search + '\uffff']
+
+        direction = 'DESC' if self.descending else 'ASC'
+        sql = (f'SELECT id FROM {TABLE[self.kind]} {where} '
+               f'ORDER BY {self.sort} {direction}, id {direction}')
+        return sql, params
+
+    def rows_sql(self, count):
+        columns = ', '.join(c for c, _, _ in COLUMNS[self.kind])
+        return f'SELECT id, {columns} FROM {TABLE[self.kind]} WHERE id IN ({", ".join("?" * count)})'
+
+
+class HistoryLoader:
+    """Runs history queries on a background thread
+
+    Results come back through a queue polled with after(), so Tk is only
+    touched from the main thread. Each reset() starts a new generation;
+    results of older generations are dropped. A query that fails is reported
+    to the request's errback(message); the loader keeps serving new requests.
+    """
+    POLL_MS = 15
+    SKIPPED = object()
+
+    class Failed:
+        def __init__(self, message):
+            self.message = message
+
+    def __init__(self, widget, connect):
+        self.widget = widget
+        self.connect = connect
+        self.generation = 0
+
+        self._requests = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = 0
+        self._polling = False
+
+        threading.Thread(target=self._run, name='history-loader', daemon=True).start()
+
+    def _submit(self, request):
+        self._pending += 1
+        self._requests.put(request)
+        if not self._polling:
+            self._polling = True
+            self.widget.after(self.POLL_MS, self._poll)
+
+    def reset(self, query, callback, errback=None):
+        """Load the ordered id list for a query: callback(ids)"""
+        self.generation += 1
+        self._submit(('ids', self.generation, query, None, (callback, errback), None))
+
+    def fetch(self, query, ids, callback, wanted=None, errback=None):
+        """Load rows for the given ids: callback({id: row})
+
+        If wanted() is false by the time the request is picked up (the page was
+        scrolled past), the query is skipped and callback(None) is called.
+        """
+        self._submit(('rows', self.generation, query, ids, (callback, errback), wanted))
+
+    def _run(self):
+        conn = None
+        while True:
+            kind, generation, query, ids, callbacks, wanted = self._requests.get()
+            if generation != self.generation:
+                self._results.put((generation, callbacks, None))
+                continue
+            if wanted is not None and not wanted():
+                self._results.put((generation, callbacks, self.SKIPPED))
+                continue
+
+            try:
+                # After a failure the next request starts on a fresh connection
+                if conn is None:
+                    conn = self.connect()
+                if kind == 'ids':
+                    sql, params = query.ids_sql()
+                    result = array('q', (r[0] for r in conn.execute(sql, params)))
+                else:
+                    result = {r[0]: r[1:] for r in conn.execute(query.rows_sql(len(ids)), list(ids))}
+            except sqlite3.Error as e:
+                if conn is not None:
+                    conn.close()
+                    conn = None
+                result = self.Failed(str(e))
+            self._results.put((generation, callbacks, result))
+
+    def _poll(self):
+        while True:
+            try:
+                generation, (callback, errback), result = self._results.get_nowait()
+            except queue.Empty:
+                break
+            self._pending -= 1
+            if generation != self.generation or result is None:
+                continue
+            if isinstance(result, self.Failed):
+                if errback is not None:
+                    errback(result.message)
+            else:
+                callback(None if result is self.SKIPPED else result)
+
+        if self._pending:
+            self.widget.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+
+class VirtualList(tk.Frame):
+    """Virtualized table: only the visible rows exist as canvas items
+
+    The full result is an ordered array of row ids; row contents are fetched
+    page by page (asynchronously) when they scroll into view and kept in a
+    small LRU of pages. Scrolling only re-labels the fixed pool of row items.
+    """
+    ROW_HEIGHT = 24
+    PAGE_SIZE = 100
+    CACHED_PAGES = 20
+
+    def __init__(self, parent, loader, on_sort=None, height=320, bg='#0a0e27'):
+        super().__init__(parent, bg=bg)
+        self.loader = loader
+        self.on_sort = on_sort
+        self.bg = bg
+
+        self.query = None
+        self.ids = array('q')
+        self.top = 0
+        self.pages = OrderedDict()
+        self.requested = set()
+
+        self.header = tk.Canvas(self, height=self.ROW_HEIGHT + 4, bg='#11163a', highlightthickness=0)
+        self.header.pack(fill=tk.X)
+
+        body = tk.Frame(self, bg=bg)
+        body.pack(fill=tk.BOTH, expand=True)
+        self.canvas = tk.Canvas(body, height=height, bg=bg, highlightthickness=0)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.scrollbar = ttk.Scrollbar(body, orient=tk.VERTICAL, command=self.yview)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+
+        self.visible = height // self.ROW_HEIGHT
+        self.slots = []
+
+        self.status = tk.Label(self, text='', font=('Segoe UI', 9), fg='#7e9bc9', bg=bg, anchor=tk.W)
+        self.status.pack(fill=tk.X)
+
+        self.canvas.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1, 'units'))
+        self.canvas.bind('<Button-4>', lambda e: self.scroll(-1, 'units'))
+        self.canvas.bind('<Button-5>', lambda e: self.scroll(1, 'units'))
+
+    def set_columns(self, columns):
+        """(Re)create the header and the pool of row items for a column set"""
+        self.columns = columns
+        self.header.delete('all')
+        self.canvas.delete('all')
+        self.slots = []
+
+        x = 8
+        for column, title, width in columns:
+            item = self.header.create_text(x, self.ROW_HEIGHT // 2 + 2, text=title, anchor=tk.W,
+                                           fill='#7e9bc9', font=('Segoe UI', 9, 'bold'))
+            self.header.tag_bind(item, '<Button-1>', lambda e, c=column: self.on_sort and self.on_sort(c))
+            x += width
+
+        for i in range(self.visible):
+            y = i * self.ROW_HEIGHT
+            stripe = self.canvas.create_rectangle(0, y, 2000, y + self.ROW_HEIGHT, outline='',
+                                                  fill='#10153a' if i % 2 else self.bg)
+            texts = []
+            x = 8
+            for _, _, width in columns:
+                texts.append(self.canvas.create_text(x, y + self.ROW_HEIGHT // 2, text='', anchor=tk.W,
+                                                     fill='#ffffff', font=('Segoe UI', 10)))
+                x += width
+            self.slots.append((stripe, texts))
+
+    def load(self, query):
+        self.query = query
+        self.status.config(text='Wczytywanie…', fg='#7e9bc9')
+        self.loader.reset(query, self.on_ids, errback=self.on_error)
+
+    def on_ids(self, ids):
+        self.ids = ids
+        self.top = 0
+        self.pages.clear()
+        self.requested.clear()
+        self.status.config(text=f'{len(ids):,} rekordów'.replace(',', ' '), fg='#7e9bc9')
+        self.render()
+
+    def on_error(self, message, page=None, ids=None):
+        # A failed page is requested again on the next render
+        if page is not None:
+            if ids is not self.ids:
+                return
+            self.requested.discard(page)
+        self.status.config(text=f'Błąd wczytywania: {message}', fg='#ef4444')
+
+    def on_page(self, page, rows, ids):
+        # Requested for an earlier id list (the query changed before its
+        # on_ids arrived): the rows belong to other positions
+        if ids is not self.ids:
+            return
+        self.requested.discard(page)
+        if rows is None:
+            return
+        start = page * self.PAGE_SIZE
+        self.pages[page] = [rows.get(i) for i in self.ids[start:start + self.PAGE_SIZE]]
+        while len(self.pages) > self.CACHED_PAGES:
+            self.pages.popitem(last=False)
+        self.render()
+
+    def row(self, index):
+        page = index // self.PAGE_SIZE
+        if page in self.pages:
+            self.pages.move_to_end(page)
+            return self.pages[page][index % self.PAGE_SIZE]
+
+        if page not in self.requested:
+            self.requested.add(page)
+            start = page * self.PAGE_SIZE
+            self.loader.fetch(self.query, self.ids[start:start + self.PAGE_SIZE],
+                              lambda rows, p=page, ids=self.ids: self.on_page(p, rows, ids),
+                              wanted=lambda p=page: self.page_visible(p),
+                              errback=lambda message, p=page, ids=self.ids: self.on_error(message, p, ids))
+        return None
+
+    def page_visible(self, page):
+        first = self.top // self.PAGE_SIZE
+        last = (self.top + self.visible) // self.PAGE_SIZE
+        return first <= page <= last
+
+    def render(self):
+        total = len(self.ids)
+        for i, (stripe, texts) in enumerate(self.slots):
+            index = self.top + i
+            if index >= total:
+                for item in texts:
+                    self.canvas.itemconfig(item, text='')
+                continue
+
+            row = self.row(index)
+            for item, value in zip(texts, row if row is not None else ['…'] + [''] * (len(texts) - 1)):
+                self.canvas.itemconfig(item, text='' if value is None else str(value).replace('\n', ' '))
+
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible) / total))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def scroll_to(self, top):
+        top = max(0, min(int(top), max(0, len(self.ids) - self.visible)))
+        if top != self.top:
+            self.top = top
+            self.render()
+
+    def scroll(self, amount, what):
+        step = self.visible if what == 'pages' else 3
+        self.scroll_to(self.top + amount * step)
+
+    def yview(self, *args):
+        if args[0] == 'moveto':
+            self.scroll_to(float(args[1]) * len(self.ids))
+        elif args[0] == 'scroll':
+            self.scroll(int(args[1]), args[2])
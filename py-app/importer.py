@@ -0,0 +1,208 @@
+import csv
+import io
+import json
+import queue
+import sqlite3
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from store import TABLES, connect, insert_sql, missing_fields
+
+
+# Header spellings accepted in import files (lower-case) -> store column
+ALIASES = {
+    'number': 'number', 'numer': 'number', 'numer dostawy': 'number', 'numer zlecenia': 'number',
+    'supplier': 'supplier', 'dostawca': 'supplier',
+    'from_location': 'from_location', 'from': 'from_location', 'z lokalizacji': 'from_location',
+    'to_location': 'to_location', 'to': 'to_location', 'do lokalizacji': 'to_location',
+    'date': 'date', 'data': 'date', 'data dostawy': 'date', 'data przeniesienia': 'date',
+    'notes': 'notes', 'uwagi': 'notes',
+    'created_at': 'created_at',
+}
+
+
+def detect_kind(columns, default='delivery'):
+    """Delivery or transfer file, judging by the columns of its first record"""
+    if 'supplier' in columns:
+        return 'delivery'
+    if 'from_location' in columns or 'to_location' in columns:
+        return 'transfer'
+    return default
+
+
+def column_for(header):
+    return ALIASES.get(str(header).strip().lower())
+
+
+class ImportJob:
+    """Streams a CSV or JSONL file into the store on a worker thread
+
+    The file is read record by record and valid rows are inserted in batched
+    transactions on the job's own connection, so memory use does not depend on
+    the file size. Rejected records go to <file>.errors.csv next to the source.
+    Progress is reported through the `events` queue, which the UI polls:
+
+        ('progress', bytes_done, bytes_total, imported, rejected)
+        ('done', imported, rejected, report_path or None)
+        ('cancelled', imported, rejected, report_path or None)
+        ('error', message)
+
+    Exactly one of the last three ends every job. Rows committed before a
+    cancel or an error stay in the store.
+    """
+    BATCH_SIZE = 5000
+    PROGRESS_EVERY = 0.1
+
+    def __init__(self, path, db_path, kind='delivery'):
+        self.path = Path(path)
+        self.db_path = db_path
+        self.kind = kind
+        self.report_path = self.path.with_name(self.path.stem + '.errors.csv')
+
+        self.imported = 0
+        self.rejected = 0
+        self.events = queue.Queue()
+        self.cancelled = threading.Event()
+
+        self._report = None
+        self._thread = threading.Thread(target=self._run, name='order-import', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def join(self, timeout=None):
+        self._thread.join(timeout)
+
+    def _records(self, text):
+        """(line number, {store column: value} or None, raw record, error) per record
+
+        CSV headers are resolved once per file; JSONL keys once per distinct key.
+        """
+        if self.path.suffix.lower() in ('.jsonl', '.ndjson', '.json'):
+            key_columns = {}
+            for line_no, line in enumerate(text, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield line_no, None, line.rstrip('\n'), f'niepoprawny JSON: {e}'
+                    continue
+                if not isinstance(record, dict):
+                    yield line_no, None, record, 'rekord nie jest obiektem JSON'
+                    continue
+
+                values = {}
+                for key, value in record.items():
+                    if key not in key_columns:
+                        key_columns[key] = column_for(key)
+                    column = key_columns[key]
+                    if column and value is not None:
+                        values[column] = str(value).strip()
+                yield line_no, values, record, None
+        else:
+            sample = text.read(4096)
+            text.seek(0)
+            try:
+                dialect = csv.Sniffer().sniff(sample, delimiters=',;\t')
+            except csv.Error:
+                dialect = csv.excel
+            reader = csv.reader(text, dialect=dialect)
+            header = next(reader, [])
+            positions = [(column_for(h), i) for i, h in enumerate(header)]
+            positions = [(c, i) for c, i in positions if c]
+            width = len(header)
+
+            for row in reader:
+                if not row:
+                    continue
+                if len(row) < width:
+                    row += [''] * (width - len(row))
+                yield reader.line_num, {c: row[i].strip() for c, i in positions}, row, None
+
+    def _reject(self, line_no, reason, record):
+        if self._report is None:
+            self._report_file = open(self.report_path, 'w', newline='', encoding='utf-8')
+            self._report = csv.writer(self._report_file)
+            self._report.writerow(['line', 'error', 'record'])
+        self._report.writerow([line_no, reason, json.dumps(record, ensure_ascii=False)])
+        self.rejected += 1
+
+    def _flush(self, conn, batch):
+        if not batch:
+            return
+        try:
+            with conn:
+                conn.executemany(insert_sql(self.kind), [row for _, _, row in batch])
+            self.imported += len(batch)
+        except sqlite3.Error as e:
+            for line_no, record, _ in batch:
+                self._reject(line_no, f'błąd zapisu: {e}', record)
+        batch.clear()
+
+    def _run(self):
+        try:
+            self._import()
+        except (OSError, UnicodeDecodeError, csv.Error, sqlite3.Error) as e:
+            self.events.put(('error', str(e)))
+        except Exception as e:
+            # Anything unexpected must still end the job, or the UI waits forever
+            traceback.print_exc()
+            self.events.put(('error', f'{type(e).__name__}: {e}'))
+        finally:
+            if self._report is not None:
+                self._report_file.close()
+
+    def _import(self):
+        total = self.path.stat().st_size
+        created_at = datetime.now().isoformat(timespec='seconds')
+        conn = connect(self.db_path)
+        batch = []
+        columns = None
+        last_progress = 0.0
+
+        with open(self.path, 'rb') as raw:
+            text = io.TextIOWrapper(raw, encoding='utf-8-sig', newline='')
+            try:
+                for line_no, values, record, error in self._records(text):
+                    if self.cancelled.is_set():
+                        break
+                    if error:
+                        self._reject(line_no, error, record)
+                        continue
+
+                    if columns is None:
+                        self.kind = detect_kind(values, self.kind)
+                        columns = TABLES[self.kind][1]
+
+                    missing = missing_fields(self.kind, values)
+                    if missing:
+                        self._reject(line_no, 'brak pola: ' + ', '.join(missing), record)
+                        continue
+
+                    if not values.get('created_at'):
+                        values['created_at'] = created_at
+                    batch.append((line_no, record, tuple(values.get(c) for c in columns)))
+                    if len(batch) >= self.BATCH_SIZE:
+                        self._flush(conn, batch)
+
+                    now = time.monotonic()
+                    if now - last_progress >= self.PROGRESS_EVERY:
+                        last_progress = now
+                        self.events.put(('progress', raw.tell(), total, self.imported, self.rejected))
+
+                self._flush(conn, batch)
+            finally:
+                text.detach()
+                conn.close()
+
+        self.events.put(('progress', total, total, self.imported, self.rejected))
+        self.events.put(('cancelled' if self.cancelled.is_set() else 'done', self.imported, self.rejected,
+                         self.report_path if self._report is not None else None))
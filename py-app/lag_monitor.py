@@ -0,0 +1,176 @@
+import sys
+import time
+import tkinter as tk
+from pathlib import Path
+
+# lib/ lives at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from lib.wrappers import timed  # noqa: E402
+
+
+# Upper bounds of the lag histogram buckets [ms]
+LAG_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, float('inf'))
+
+
+def unwrap_after(func):
+    """after()/after_idle() register a local `callit` closure; return the function it calls"""
+    code = getattr(func, '__code__', None)
+    if code is not None and code.co_name == 'callit' and func.__closure__:
+        cells = dict(zip(code.co_freevars, func.__closure__))
+        if 'func' in cells:
+            return cells['func'].cell_contents
+    return func
+
+
+def callback_name(func):
+    """Readable name of a Tcl callback target"""
+    target = unwrap_after(func)
+    name = getattr(target, '__qualname__', None) or type(target).__name__
+    return 'after: ' + name if target is not func else name
+
+
+class LagMonitor:
+    """Main-loop lag probe and per-callback timing for a Tk app
+
+    A heartbeat after() measures how late the event loop runs it; every
+    Python callback Tcl invokes (bind handlers, widget commands, after
+    callbacks) is timed by wrapping tkinter.CallWrapper targets with
+    lib.wrappers.timed. Stalls longer than `stall_ms` are printed together
+    with the slowest callback that ran since the previous heartbeat.
+
+    F12 toggles an overlay with the lag histogram and the slowest handlers,
+    Ctrl+Shift+D prints the same report to stdout.
+
+    Nothing is patched until install(); uninstall() puts tkinter.CallWrapper
+    and the watched methods back and stops the heartbeat.
+    """
+    def __init__(self, root, interval_ms=50, stall_ms=250, top=8):
+        self.root = root
+        self.interval_ms = interval_ms
+        self.stall_ms = stall_ms
+        self.top = top
+
+        # name -> [calls, total seconds, max seconds]
+        self.callbacks = {}
+        self.histogram = [0] * len(LAG_BUCKETS)
+        self.max_lag_ms = 0.0
+        self.stalls = []
+        self.beat_slowest = ('', 0.0)
+
+        self.overlay = None
+        self._expected = None
+        self._original_init = None
+        self._internal = set()
+        self._watched = []
+        self._beat_id = None
+
+    def record(self, name, seconds):
+        stats = self.callbacks.get(name)
+        if stats is None:
+            stats = self.callbacks[name] = [0, 0.0, 0.0]
+        stats[0] += 1
+        stats[1] += seconds
+        if seconds > stats[2]:
+            stats[2] = seconds
+        if seconds > self.beat_slowest[1]:
+            self.beat_slowest = (name, seconds)
+
+    def watch(self, obj, *methods):
+        """Time methods that are called directly rather than through Tcl"""
+        for method in methods:
+            func = getattr(obj, method)
+            self._watched.append((obj, method, method in vars(obj), vars(obj).get(method)))
+            setattr(obj, method, timed(self.record, callback_name(func))(func))
+
+    def install(self):
+        if self._original_init is not None:
+            return self
+        monitor = self
+        original_init = self._original_init = tk.CallWrapper.__init__
+
+        def init(wrapper, func, subst, widget):
+            if unwrap_after(func) not in monitor._internal:
+                func = timed(monitor.record, callback_name(func))(func)
+            original_init(wrapper, func, subst, widget)
+
+        tk.CallWrapper.__init__ = init
+
+        self.root.bind_all('<F12>', self.internal(lambda e: self.toggle_overlay()), add='+')
+        self.root.bind_all('<Control-D>', self.internal(lambda e: print(self.report())), add='+')
+        self.beat()
+        return self
+
+    def uninstall(self):
+        """Undo install() and watch(); callbacks wrapped so far stay timed"""
+        if self._original_init is not None:
+            tk.CallWrapper.__init__ = self._original_init
+            self._original_init = None
+        if self._beat_id is not None:
+            self.root.after_cancel(self._beat_id)
+            self._beat_id = None
+        for obj, method, had_own, original in reversed(self._watched):
+            if had_own:
+                setattr(obj, method, original)
+            else:
+                delattr(obj, method)
+        self._watched.clear()
+
+    def internal(self, func):
+        """Mark a callback of the monitor itself, so it is not timed"""
+        self._internal.add(func)
+        return func
+
+    def beat(self):
+        now = time.perf_counter()
+        if self._expected is not None:
+            lag_ms = max(0.0, (now - self._expected) * 1000)
+            for i, bound in enumerate(LAG_BUCKETS):
+                if lag_ms < bound:
+                    self.histogram[i] += 1
+                    break
+            self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+
+            if lag_ms >= self.stall_ms:
+                name, seconds = self.beat_slowest
+                self.stalls.append((lag_ms, name, seconds))
+                print(f"[LagMonitor] : main loop stalled {lag_ms:.0f} ms "
+                      f"(slowest callback: {name or '?'} {seconds * 1000:.0f} ms)")
+
+        self.beat_slowest = ('', 0.0)
+        self._expected = now + self.interval_ms / 1000
+        self._beat_id = self.root.after(self.interval_ms, self.internal(self.beat))
+
+    def report(self):
+        beats = sum(self.histogram) or 1
+        lines = [f'Opóźnienie pętli (max {self.max_lag_ms:.0f} ms, zacięcia: {len(self.stalls)})']
+        lower = 0
+        for bound, count in zip(LAG_BUCKETS, self.histogram):
+            label = f'{lower}-{bound} ms' if bound != float('inf') else f'>{lower} ms'
+            bar = '#' * round(30 * count / beats)
+            lines.append(f'  {label:>12} {count:>7} {bar}')
+            lower = bound
+
+        lines.append('')
+        lines.append(f'{"handler":<44}{"calls":>7}{"avg ms":>9}{"max ms":>9}')
+        slowest = sorted(self.callbacks.items(), key=lambda item: item[1][2], reverse=True)
+        for name, (calls, total, worst) in slowest[:self.top]:
+            lines.append(f'{name[-44:]:<44}{calls:>7}{total / calls * 1000:>9.2f}{worst * 1000:>9.1f}')
+        return '\n'.join(lines)
+
+    def toggle_overlay(self):
+        if self.overlay is not None:
+            self.overlay.destroy()
+            self.overlay = None
+            return
+
+        self.overlay = tk.Label(self.root, justify=tk.LEFT, anchor=tk.NW, font=('Consolas', 8),
+                                fg='#e2e8f0', bg='#111827', padx=8, pady=6)
+        self.overlay.place(x=8, y=8)
+        self.refresh_overlay()
+
+    def refresh_overlay(self):
+        if self.overlay is None:
+            return
+        self.overlay.config(text=self.report())
+        self.overlay.lift()
+        self.root.after(500, self.internal(self.refresh_overlay))
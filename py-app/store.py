@@ -0,0 +1,232 @@
+import os
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+from pathlib import Path
+
+
+DEFAULT_DB_PATH = Path(os.environ.get(
+    'PYAPP_DB', Path.home() / '.system_logistyczny' / 'orders.db'))
+
+# kind -> (table, columns written by the app)
+TABLES = {
+    'delivery': ('deliveries', ('number', 'supplier', 'date', 'notes', 'created_at')),
+    'transfer': ('transfers', ('number', 'from_location', 'to_location', 'date', 'created_at')),
+}
+
+# Fields that must be filled in before a row is saved (forms and import)
+REQUIRED = {
+    'delivery': ('number', 'supplier'),
+    'transfer': ('number', 'from_location', 'to_location'),
+}
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS deliveries (
+    id INTEGER PRIMARY KEY,
+    number TEXT NOT NULL,
+    supplier TEXT NOT NULL,
+    date TEXT,
+    notes TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deliveries_number ON deliveries(number);
+CREATE INDEX IF NOT EXISTS idx_deliveries_supplier ON deliveries(supplier);
+CREATE INDEX IF NOT EXISTS idx_deliveries_date ON deliveries(date);
+
+CREATE TABLE IF NOT EXISTS transfers (
+    id INTEGER PRIMARY KEY,
+    number TEXT NOT NULL,
+    from_location TEXT NOT NULL,
+    to_location TEXT NOT NULL,
+    date TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_transfers_number ON transfers(number);
+CREATE INDEX IF NOT EXISTS idx_transfers_from ON transfers(from_location);
+CREATE INDEX IF NOT EXISTS idx_transfers_to ON transfers(to_location);
+CREATE INDEX IF NOT EXISTS idx_transfers_date ON transfers(date);
+
+-- Rows waiting to be sent to the central system (see sync.py); filled by
+-- triggers, so form saves and bulk imports are queued in the same transaction
+CREATE TABLE IF NOT EXISTS outbox (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    row_id INTEGER NOT NULL,
+    failed INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_outbox_failed ON outbox(failed, id);
+CREATE TRIGGER IF NOT EXISTS outbox_deliveries AFTER INSERT ON deliveries
+BEGIN
+    INSERT INTO outbox (kind, row_id) VALUES ('delivery', NEW.id);
+END;
+CREATE TRIGGER IF NOT EXISTS outbox_transfers AFTER INSERT ON transfers
+BEGIN
+    INSERT INTO outbox (kind, row_id) VALUES ('transfer', NEW.id);
+END;
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+'''
+
+_STOP = object()
+
+# Backoff between attempts to write a batch that failed (locked/full disk...)
+RETRY_MIN = 0.5
+RETRY_MAX = 30.0
+
+
+def missing_fields(kind, values):
+    """Required fields that are empty or whitespace only (forms and import)"""
+    return [c for c in REQUIRED[kind] if not str(values.get(c) or '').strip()]
+
+
+def insert_sql(kind):
+    table, columns = TABLES[kind]
+    return f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+
+
+def connect(path):
+    """Connection with the pragmas every user of the store needs"""
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+    conn.execute('PRAGMA busy_timeout=30000')
+    return conn
+
+
+class OrderStore:
+    """Local store of deliveries and transfers (SQLite in WAL mode)
+
+    add_delivery()/add_transfer() only enqueue the row; a background writer
+    thread drains the queue and inserts rows in batched transactions, so the
+    Tk main loop never waits for disk I/O.
+
+    A batch that fails is kept and retried with backoff; until it succeeds
+    `unsaved` holds the number of rows not yet on disk and `last_error` the
+    reason, for the UI to show. Only rows the database rejects on their own
+    (constraint errors) are dropped and counted in `errors`.
+    """
+    def __init__(self, path=DEFAULT_DB_PATH, batch_size=500, batch_window=0.05):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.batch_window = batch_window
+
+        with closing(connect(self.path)) as conn:
+            conn.executescript(SCHEMA)
+
+        self.written = 0
+        self.errors = 0
+        self.unsaved = 0
+        self.last_error = None
+        self.listeners = []
+
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name='order-store-writer', daemon=True)
+        self._writer.start()
+
+    def add(self, kind, **values):
+        table, columns = TABLES[kind]
+        values.setdefault('created_at', datetime.now().isoformat(timespec='seconds'))
+        self._queue.put((kind, tuple(values.get(c) for c in columns)))
+        for listener in self.listeners:
+            listener(kind, values)
+
+    def add_delivery(self, number, supplier, date, notes=''):
+        self.add('delivery', number=number, supplier=supplier, date=date, notes=notes)
+
+    def add_transfer(self, number, from_location, to_location, date):
+        self.add('transfer', number=number, from_location=from_location,
+                 to_location=to_location, date=date)
+
+    def reader(self):
+        """New connection for queries (one per thread)"""
+        return connect(self.path)
+
+    def flush(self):
+        """Block until everything enqueued so far was written or is held for
+        retry (see `unsaved`)"""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+
+    def _next_batch(self, timeout=None):
+        """First item blocks (up to timeout); then gather more for up to
+        batch_window seconds"""
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + self.batch_window
+        while len(batch) < self.batch_size and batch[-1] is not _STOP:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=max(0, remaining)) if remaining > 0
+                             else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write_loop(self):
+        conn = connect(self.path)
+        pending = []  # rows of failed batches, written again before new ones
+        delay = RETRY_MIN
+        try:
+            while True:
+                batch = self._next_batch(timeout=delay if pending else None)
+                stop = bool(batch) and batch[-1] is _STOP
+                rows = pending + [item for item in batch if item is not _STOP]
+
+                try:
+                    if rows:
+                        self._write_rows(conn, rows)
+                    pending, delay = [], RETRY_MIN
+                    self.unsaved, self.last_error = 0, None
+                except sqlite3.Error as e:
+                    pending, delay = rows, min(delay * 2, RETRY_MAX)
+                    self.unsaved, self.last_error = len(rows), str(e)
+                    print(f"[OrderStore] : write of {len(rows)} rows failed, retrying in {delay:.1f}s: {e}")
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+
+                if stop:
+                    if pending:
+                        print(f"[OrderStore] : {len(pending)} rows not saved at shutdown: {self.last_error}")
+                    break
+        finally:
+            conn.close()
+
+    def _write_rows(self, conn, rows):
+        """Write a batch; if a row violates a constraint, fall back to one
+        transaction per row so only the offending rows are dropped"""
+        try:
+            self._write(conn, rows)
+        except sqlite3.IntegrityError:
+            for row in rows:
+                try:
+                    self._write(conn, [row])
+                except sqlite3.IntegrityError as e:
+                    self.errors += 1
+                    print(f"[OrderStore] : rejected {row}: {e}")
+                    continue
+                self.written += 1
+            return
+        self.written += len(rows)
+
+    def _write(self, conn, rows):
+        by_kind = {}
+        for kind, row in rows:
+            by_kind.setdefault(kind, []).append(row)
+
+        with conn:
+            for kind, kind_rows in by_kind.items():
+                conn.executemany(insert_sql(kind), kind_rows)
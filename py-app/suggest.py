@@ -0,0 +1,128 @@
+import threading
+from bisect import bisect_left
+from collections import OrderedDict
+
+
+# index name -> [(kind, column)] feeding it
+SOURCES = {
+    'supplier': [('delivery', 'supplier')],
+    'location': [('transfer', 'from_location'), ('transfer', 'to_location')],
+}
+TABLE = {'delivery': 'deliveries', 'transfer': 'transfers'}
+
+
+class PrefixIndex:
+    """Sorted array of distinct values answering prefix queries with bisect
+
+    Matching is case-insensitive. Recently used values come first, the rest
+    of the matches follow in alphabetical order. replace() may run on another
+    thread: the new arrays are built completely before they are published,
+    and every read and write of the index state holds the lock.
+    """
+    RECENT = 256
+
+    def __init__(self, values=(), recent=()):
+        self.lock = threading.Lock()
+        self.sorted = ([], [])
+        self.recent = OrderedDict()
+        self.replace(values, recent)
+
+    def replace(self, values, recent=()):
+        """Swap in a freshly loaded value set (recent: oldest first)"""
+        pairs = sorted({v.casefold(): v for v in values if v}.items())
+        keys, loaded = [k for k, _ in pairs], [v for _, v in pairs]
+        with self.lock:
+            # Values saved while the set was loading stay recent
+            merged = OrderedDict((v, None) for v in list(recent)[-self.RECENT:] if v)
+            for value in self.recent:
+                merged[value] = None
+                merged.move_to_end(value)
+            for value in merged:
+                self._insert(keys, loaded, value)
+            self._trim(merged)
+            self.sorted = (keys, loaded)
+            self.recent = merged
+
+    def add(self, value):
+        """Record a saved value: insert it if new and mark it as recently used"""
+        value = value.strip()
+        if not value:
+            return
+        with self.lock:
+            keys, values = self.sorted
+            self._insert(keys, values, value)
+            self.recent[value] = None
+            self.recent.move_to_end(value)
+            self._trim(self.recent)
+
+    @staticmethod
+    def _insert(keys, values, value):
+        key = value.casefold()
+        i = bisect_left(keys, key)
+        if i == len(keys) or keys[i] != key:
+            keys.insert(i, key)
+            values.insert(i, value)
+
+    def _trim(self, recent):
+        while len(recent) > self.RECENT:
+            recent.popitem(last=False)
+
+    def __len__(self):
+        return len(self.sorted[0])
+
+    def complete(self, prefix, limit=8):
+        prefix = prefix.strip().casefold()
+        if not prefix:
+            return []
+
+        # The lock is held for microseconds: a bisect plus at most `limit` steps
+        with self.lock:
+            keys, values = self.sorted
+            matches = [v for v in reversed(self.recent) if v.casefold().startswith(prefix)][:limit]
+            seen = set(matches)
+            i = bisect_left(keys, prefix)
+            while len(matches) < limit and i < len(keys) and keys[i].startswith(prefix):
+                if values[i] not in seen:
+                    matches.append(values[i])
+                i += 1
+        return matches
+
+
+class Suggestions:
+    """Autocomplete indexes of the form fields, fed by the order store
+
+    Indexes start empty and are filled from the store on a background thread;
+    afterwards every saved row updates them through store.listeners.
+    """
+    def __init__(self, store):
+        self.store = store
+        self.indexes = {name: PrefixIndex() for name in SOURCES}
+        store.listeners.append(self.on_saved)
+
+    def __getitem__(self, name):
+        return self.indexes[name]
+
+    def load(self):
+        threading.Thread(target=self._load, name='suggestions-loader', daemon=True).start()
+
+    def _load(self):
+        conn = self.store.reader()
+        try:
+            for name, sources in SOURCES.items():
+                # Distinct values come straight from the column indexes; the
+                # newest rows give the initial "recently used" order
+                last_used = {}
+                for kind, column in sources:
+                    for value, last_id in conn.execute(
+                            f'SELECT {column}, MAX(id) FROM {TABLE[kind]} GROUP BY {column}'):
+                        last_used[value] = max(last_id, last_used.get(value, 0))
+                recent = sorted(last_used, key=last_used.get)[-PrefixIndex.RECENT:]
+                self.indexes[name].replace(last_used, recent)
+        finally:
+            conn.close()
+
+    def on_saved(self, kind, values):
+        for name, sources in SOURCES.items():
+            for source_kind, column in sources:
+                if source_kind == kind and values.get(column):
+                    self.indexes[name].add(values[column])
@@ -0,0 +1,229 @@
+import gzip
+import hashlib
+import http.client
+import json
+import os
+import random
+import threading
+import traceback
+import uuid
+from collections import namedtuple
+from datetime import datetime
+from urllib.parse import urlsplit
+
+from store import TABLES, connect
+
+
+SYNC_URL = os.environ.get('PYAPP_SYNC_URL', '')
+
+SyncStatus = namedtuple('SyncStatus', 'state pending failed last_sync error')
+
+
+def device_id(conn):
+    """Stable id of this installation, part of every idempotency key"""
+    with conn:
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('device_id', ?)",
+                     (uuid.uuid4().hex,))
+    return conn.execute("SELECT value FROM meta WHERE key = 'device_id'").fetchone()[0]
+
+
+class SyncClient:
+    """Sends the outbox of saved orders to the central order API
+
+    A background thread takes up to batch_size outbox rows, POSTs them as one
+    gzip-compressed JSON batch over a kept-alive HTTP connection and deletes
+    them once the server accepts the batch. Every order carries the key
+    <device>:<kind>:<row id>, so a batch retried after a lost response is
+    deduplicated by the server. Network errors and 5xx/429 back off
+    exponentially (with jitter, honouring Retry-After); rows of a batch the
+    server rejects with another 4xx are parked as failed; while only failed
+    rows are left the state is 'failed', not 'synced'. Any other error is
+    logged and retried with the same backoff, so the thread never dies.
+
+    The UI reads `status` (a SyncStatus tuple, replaced atomically) and never
+    waits for the thread.
+    """
+    RETRY_STATUSES = (408, 425, 429, 500, 502, 503, 504)
+
+    def __init__(self, db_path, url=SYNC_URL, batch_size=200, timeout=10,
+                 poll_interval=15.0, settle=0.5, max_backoff=60.0):
+        self.db_path = db_path
+        self.url = urlsplit(url)
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.settle = settle
+        self.max_backoff = max_backoff
+
+        self.status = SyncStatus('starting', 0, 0, None, None)
+        self.sent = 0
+        self.requests = 0
+
+        self._conn = None
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='order-sync', daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def wake(self, *args):
+        """Flush soon; usable directly as a store listener"""
+        self._wake.set()
+
+    def stop(self, timeout=2.0):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+
+    # HTTP
+
+    def _connection(self):
+        if self._conn is None:
+            cls = http.client.HTTPSConnection if self.url.scheme == 'https' else http.client.HTTPConnection
+            self._conn = cls(self.url.hostname, self.url.port, timeout=self.timeout)
+        return self._conn
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _post(self, body, headers):
+        # A kept-alive connection the server has already closed fails on first
+        # use; the request is idempotent, so retry once on a fresh connection
+        for attempt in (1, 2):
+            conn = self._connection()
+            try:
+                conn.request('POST', self.url.path or '/', body, headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+                self._close()
+                if attempt == 2:
+                    raise
+                continue
+            except (OSError, http.client.HTTPException):
+                self._close()
+                raise
+
+            if response.getheader('Connection', '').lower() == 'close':
+                self._close()
+            return response.status, response.getheader('Retry-After'), data
+
+    # Outbox
+
+    def _next_batch(self, db):
+        entries = db.execute('SELECT id, kind, row_id FROM outbox WHERE failed = 0 ORDER BY id LIMIT ?',
+                             (self.batch_size,)).fetchall()
+        by_kind = {}
+        for entry_id, kind, row_id in entries:
+            by_kind.setdefault(kind, {})[row_id] = entry_id
+
+        orders, entry_ids = [], []
+        for kind, rows in by_kind.items():
+            table, columns = TABLES[kind]
+            found = db.execute(
+                f'SELECT id, {", ".join(columns)} FROM {table} WHERE id IN ({", ".join("?" * len(rows))})',
+                list(rows))
+            for row_id, *values in found:
+                orders.append({'key': f'{self.device}:{kind}:{row_id}', 'kind': kind,
+                               **dict(zip(columns, values))})
+            entry_ids += rows.values()
+        return orders, entry_ids
+
+    def _publish(self, db, state, error=None):
+        pending, failed = db.execute(
+            'SELECT COUNT(*) FILTER (WHERE failed = 0), COUNT(*) FILTER (WHERE failed = 1) FROM outbox'
+        ).fetchone()
+        last_sync = datetime.now() if state == 'synced' else self.status.last_sync
+        if state == 'synced' and failed:
+            # Nothing left to send, but rejected rows still need attention
+            state = 'failed'
+            error = db.execute('SELECT last_error FROM outbox WHERE failed = 1 ORDER BY id DESC LIMIT 1'
+                               ).fetchone()[0]
+        self.status = SyncStatus(state, pending, failed, last_sync, error)
+
+    def _send(self, orders):
+        keys = [order['key'] for order in orders]
+        body = gzip.compress(json.dumps({'device': self.device, 'orders': orders},
+                                        ensure_ascii=False).encode('utf-8'))
+        headers = {
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'gzip',
+            'Idempotency-Key': hashlib.sha256('\n'.join(keys).encode()).hexdigest(),
+        }
+        self.requests += 1
+        return self._post(body, headers)
+
+    def _backoff(self, failures, retry_after=None):
+        if retry_after and retry_after.isdigit():
+            return min(self.max_backoff, float(retry_after))
+        return min(self.max_backoff, 2 ** failures) * random.uniform(0.5, 1.0)
+
+    def _run(self):
+        db = None
+        failures = 0
+        try:
+            while not self._stop.is_set():
+                try:
+                    if db is None:
+                        db = connect(self.db_path)
+                        self.device = device_id(db)
+                    ok, retry_after = self._step(db)
+                    if ok:
+                        failures = 0
+                    else:
+                        failures += 1
+                        self._stop.wait(self._backoff(failures, retry_after))
+                except Exception as e:
+                    # Outbox locked/unreadable or a bug: log, reconnect and try again later
+                    traceback.print_exc()
+                    print(f"[SyncClient] : sync step failed: {e}")
+                    self.status = self.status._replace(state='error', error=str(e))
+                    if db is not None:
+                        db.close()
+                        db = None
+                    failures += 1
+                    self._stop.wait(self._backoff(failures))
+        finally:
+            self._close()
+            if db is not None:
+                db.close()
+
+    def _step(self, db):
+        """Send one batch (or wait for new rows): (ok, Retry-After header);
+        not ok means back off before the next attempt"""
+        orders, entry_ids = self._next_batch(db)
+        if not entry_ids:
+            self._publish(db, 'synced')
+            self._wake.wait(self.poll_interval)
+            self._wake.clear()
+            # Let the store writer commit the rows that woke us up
+            self._stop.wait(self.settle)
+            return True, None
+
+        self._publish(db, 'syncing', self.status.error)
+        try:
+            status, retry_after, data = self._send(orders) if orders else (200, None, b'')
+        except (OSError, http.client.HTTPException) as e:
+            self._publish(db, 'offline', str(e))
+            return False, None
+
+        marks = ', '.join('?' * len(entry_ids))
+        if 200 <= status < 300:
+            self.sent += len(orders)
+            with db:
+                db.execute(f'DELETE FROM outbox WHERE id IN ({marks})', entry_ids)
+        elif status in self.RETRY_STATUSES:
+            self._publish(db, 'offline', f'HTTP {status}')
+            return False, retry_after
+        else:
+            error = f'HTTP {status}: {data[:200].decode("utf-8", "replace")}'
+            print(f"[SyncClient] : batch of {len(entry_ids)} rejected: {error}")
+            with db:
+                db.execute(f'UPDATE outbox SET failed = 1, last_error = ? WHERE id IN ({marks})',
+                           [error, *entry_ids])
+            self._publish(db, 'error', error)
+        return True, None
@@ -0,0 +1,104 @@
+"""Local stand-in for the central order API, for trying out sync.py
+
+Accepts gzip-compressed JSON batches on POST /orders/batch and deduplicates
+orders by their key. --fail-rate and --drop-rate imitate a flaky network.
+
+    python py-app/sync_server.py --port 8765 --fail-rate 0.3
+    PYAPP_SYNC_URL=http://127.0.0.1:8765/orders/batch python py-app/app.py
+"""
+import argparse
+import gzip
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class OrderAPI(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fail_rate=0.0, drop_rate=0.0, latency=0.0):
+        super().__init__(address, OrderHandler)
+        self.fail_rate = fail_rate
+        self.drop_rate = drop_rate
+        self.latency = latency
+
+        self.lock = threading.Lock()
+        self.orders = {}
+        self.batches = 0
+        self.duplicates = 0
+        self.connections = set()
+
+
+class OrderHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, payload, headers=()):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        with server.lock:
+            server.connections.add(self.client_address)
+
+        if self.path != '/orders/batch':
+            return self.reply(404, {'error': 'not found'})
+        if server.latency:
+            time.sleep(server.latency)
+        if random.random() < server.fail_rate:
+            return self.reply(503, {'error': 'unavailable'}, [('Retry-After', '1')])
+
+        try:
+            if self.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+            orders = json.loads(body)['orders']
+        except (OSError, ValueError, KeyError) as e:
+            return self.reply(400, {'error': str(e)})
+
+        with server.lock:
+            server.batches += 1
+            fresh = [o for o in orders if o['key'] not in server.orders]
+            server.duplicates += len(orders) - len(fresh)
+            server.orders.update((o['key'], o) for o in fresh)
+
+        if random.random() < server.drop_rate:
+            # Stored, but the response is lost: the client must retry safely
+            self.close_connection = True
+            self.connection.close()
+            return
+        self.reply(200, {'accepted': len(fresh), 'duplicates': len(orders) - len(fresh)})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='share of batches answered with 503')
+    parser.add_argument('--drop-rate', type=float, default=0.0, help='share of stored batches with no response')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every request')
+    args = parser.parse_args()
+
+    server = OrderAPI(('127.0.0.1', args.port), args.fail_rate, args.drop_rate, args.latency)
+    print(f"[sync_server] : listening on http://127.0.0.1:{args.port}/orders/batch")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        print(f"[sync_server] : {len(server.orders)} orders in {server.batches} batches, "
+              f"{server.duplicates} duplicates, {len(server.connections)} client connections")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""
+    Podkomenda `probe` (webscrapping/cli.py) na nieosiagalnym adresie:
+    blad polaczenia ma dac sukces 0%, a nie wywrocic calego run().
+
+        python -m pytest tests
+"""
+import asyncio
+import importlib
+import importlib.util
+import io
+import socket
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+from webscrapping import cli
+
+async_module = importlib.import_module("webscrapping.async")
+
+HAS_AIOHTTP = importlib.util.find_spec("aiohttp") is not None
+
+
+def unreachable_url() -> str:
+    # Port zwolniony zaraz po przydzieleniu - nikt na nim nie slucha
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    return f"http://127.0.0.1:{port}/"
+
+
+class RefusingSession:
+    """Sesja, ktorej kazde zapytanie konczy sie odmowa polaczenia"""
+
+    def get(self, url):
+        return self
+
+    async def __aenter__(self):
+        raise ConnectionRefusedError("Connect call failed")
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class ProbeUnreachableTest(unittest.TestCase):
+
+    def test_run_reports_failure_instead_of_crashing(self):
+        with mock.patch.object(async_module, "get_session", RefusingSession), redirect_stdout(io.StringIO()):
+            output = asyncio.run(async_module.AsyncURL(concurrency=2).run(url_list=[unreachable_url()] * 3))
+
+        self.assertEqual(output["result"]["success"], 0.0)
+
+    @unittest.skipUnless(HAS_AIOHTTP, "aiohttp nie jest zainstalowany")
+    def test_cli_probe_unreachable_url(self):
+        stdout = io.StringIO()
+        with redirect_stdout(stdout):
+            cli.main(["probe", unreachable_url(), "--count", "2"])
+
+        self.assertIn("sukces: 0.0%", stdout.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,13 +1,18 @@
+from __future__ import annotations
+
 import asyncio
-import aiohttp
-import requests
-from typing import List, Callable
-from lib.wrappers import func_timing, debugIO
+from typing import TYPE_CHECKING, List, Callable
+from lib.wrappers import func_timing, span, start_tracing, export_chrome_trace
+from lib.http_client import get_session, get_sync_session, close_session, create_session
 
+import os
 import json
-from bs4 import BeautifulSoup
 from pathlib import Path
 
+# aiohttp tylko do adnotacji - sesje tworzy lib.http_client
+if TYPE_CHECKING:
+    import aiohttp
+
 
 class TestAsyncURL:
     """
@@ -27,7 +32,7 @@ class TestAsyncURL:
                 Synchroniczne pobranie, zwraca status code
             """
             try:
-                resp = requests.get(self.url_testing, timeout=10)
+                resp = get_sync_session().get(self.url_testing, timeout=10)
                 return resp.status_code
             except Exception as e:
                 print(f"Błąd requests: {e}")
@@ -56,26 +61,9 @@ class TestAsyncURL:
                 print(f"Błąd aiohttp: {repr(e)}")
                 return 0
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-        }
-
-        timeout = aiohttp.ClientTimeout(
-            total=60,
-            connect=10,
-            sock_read=10,
-        )
-
-        connector = aiohttp.TCPConnector(
-            limit=0, 
-            limit_per_host=0
-        )
-
-        async with aiohttp.ClientSession(
-            headers=headers,
-            timeout=timeout,
-            connector=connector,
-        ) as session:
+        # Wlasna sesja bez limitow polaczen - wspoldzielona (lib.http_client)
+        # ma limit_per_host=20, wiec "bez limitu" nie roznilby sie od wersji z semaforem
+        async with create_session(limit=0, limit_per_host=0) as session:
             tasks = [fetch_async(session) for _ in range(self.test_count)]
             results = await asyncio.gather(*tasks)
 
@@ -101,28 +89,9 @@ class TestAsyncURL:
             async with semaphore:
                 return await fetch_async(session)
 
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-        }
-
-        timeout = aiohttp.ClientTimeout(
-            total=60,
-            connect=10,
-            sock_read=10,
-        )
-
-        connector = aiohttp.TCPConnector(
-            limit=0,
-            limit_per_host=0
-        )
-
-        async with aiohttp.ClientSession(
-            headers=headers,
-            timeout=timeout,
-            connector=connector,
-        ) as session:
-            tasks = [bounded_fetch(session) for _ in range(self.test_count)]
-            results = await asyncio.gather(*tasks)
+        session = get_session()
+        tasks = [bounded_fetch(session) for _ in range(self.test_count)]
+        results = await asyncio.gather(*tasks)
 
         success = sum(1 for r in results if r == 200)
         print(f"Sukces: {success}/{self.test_count}")
@@ -154,61 +123,53 @@ class AsyncURL:
 
         async def fetch_async(session: aiohttp.ClientSession, url: str, fetch_resp_mod: Callable = None) -> dict:
             try:
-                async with session.get(url=url) as resp:
-                    html: str = await resp.text()
+                with span("http", url=url):
+                    async with session.get(url=url) as resp:
+                        html: str = await resp.text()
 
                 if fetch_resp_mod is not None:
-                    await asyncio.to_thread(fetch_resp_mod, html=html, url=url)
+                    with span("resp_mod"):
+                        await asyncio.to_thread(fetch_resp_mod, html=html, url=url)
 
                 return {
                     'status': resp.status
                 }
             except Exception as e:
                 print(f"Błąd aiohttp: {repr(e)}")
-                return 0
+                # Nieosiagalny adres to wynik (status 0), nie blad calego run()
+                return {
+                    'status': 0
+                }
 
         async def bounded_fetch(semaphore: asyncio.Semaphore, session: aiohttp.ClientSession, bounded_url: str, bounded_resp_mod: Callable = None):
-            async with semaphore:
-                return await fetch_async(
-                    session=session,
-                    url=bounded_url,
-                    fetch_resp_mod=bounded_resp_mod
-                )
+            with span("bounded_fetch", url=bounded_url):
+                with span("semaphore_wait"):
+                    await semaphore.acquire()
+                try:
+                    return await fetch_async(
+                        session=session,
+                        url=bounded_url,
+                        fetch_resp_mod=bounded_resp_mod
+                    )
+                finally:
+                    semaphore.release()
         sem = asyncio.Semaphore(self.concurrency)
-        
-        headers: dict = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-        }
 
-        timeout = aiohttp.ClientTimeout(
-            total=60,
-            connect=10,
-            sock_read=10,
-        )
-
-        connector = aiohttp.TCPConnector(
-            limit=0,
-            limit_per_host=0
-        )
-
-        async with aiohttp.ClientSession(
-            headers=headers,
-            timeout=timeout,
-            connector=connector,
-        ) as session:
-            tasks = [
-                bounded_fetch(
-                    semaphore=sem,
-                    session=session,
-                    bounded_url=url,
-                    bounded_resp_mod=resp_mod
-                ) 
-                for url in url_list
-            ]
-            results = await asyncio.gather(*tasks)
+        # Wspoldzielona sesja - cieple polaczenia miedzy kolejnymi run()
+        session = get_session()
+        tasks = [
+            bounded_fetch(
+                semaphore=sem,
+                session=session,
+                bounded_url=url,
+                bounded_resp_mod=resp_mod
+            ) 
+            for url in url_list
+        ]
+        results = await asyncio.gather(*tasks)
 
         return {
-            'success': float(sum(1 for el in results if el['status'] == 200)/len(url_list)),
+            'success': float(sum(1 for el in results if el.get('status') == 200)/len(url_list)) if url_list else 0.0,
             # 'working_urls_data': [el['text'] for el in results if el['status'] == 200]
         }
 
@@ -226,8 +187,11 @@ async def main() -> None:
             :param output_file: Plik JSON do dopisania
         """
         if 'html' in kwargs and 'url' in kwargs:
-            soup = BeautifulSoup(kwargs['html'], "html.parser")
-            divs = soup.find_all("div", class_="swagger-ui")
+            from bs4 import BeautifulSoup
+
+            with span("parse_html"):
+                soup = BeautifulSoup(kwargs['html'], "html.parser")
+                divs = soup.find_all("div", class_="swagger-ui")
 
             if divs:
                 data = {"url": kwargs['url'], "found": True}
@@ -255,10 +219,21 @@ async def main() -> None:
 
     async_instacne: AsyncURL = AsyncURL()
 
-    output = await async_instacne.run(
-        url_list=['https://httpbin.org/' for _ in range(100)],
-        resp_mod=find_swagger_div_and_save
-    )
+    # TRACE_FILE=trace.json - os czasu calego crawla do otwarcia w Perfetto
+    trace_file = os.environ.get("TRACE_FILE")
+    if trace_file:
+        start_tracing()
+
+    try:
+        with span("crawl"):
+            output = await async_instacne.run(
+                url_list=['https://httpbin.org/' for _ in range(100)],
+                resp_mod=find_swagger_div_and_save
+            )
+    finally:
+        await close_session()
+        if trace_file:
+            print(f"Zapisano {export_chrome_trace(trace_file)} spanow do {trace_file}")
 
     # async_instance: TestAsyncURL = TestAsyncURL(
     #     concurrency=CONCURRENCY,
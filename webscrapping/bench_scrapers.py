@@ -0,0 +1,127 @@
+"""
+    Benchmark regresji scraperow na nagranym archiwum (bez ruchu do te.com).
+
+    Uruchamia fetch_all_requests, fetch_all_aiohttp (przez lokalny serwer z
+    archiwum) oraz samo wyciaganie linku z HTML (extract_datasheet) i porownuje
+    przepustowosc [strony/s] z zapisana baza. Spadek wiekszy niz --threshold
+    konczy program kodem 1.
+
+        python -m webscrapping.http_archive record --archive te.archive   (raz, patrz http_archive.py)
+        python -m webscrapping.bench_scrapers --archive te.archive --update-baseline
+        python -m webscrapping.bench_scrapers --archive te.archive --latency zero
+"""
+import argparse
+import asyncio
+import json
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from lib.http_client import close_session
+from webscrapping import webscrapper
+from webscrapping.http_archive import ArchiveReader, ArchiveServer
+
+PRODUCT_PATH = re.compile(r"^/en/product-(.+)\.html$")
+BASELINE_FILE = Path(__file__).with_name("bench_baseline.json")
+
+
+def bench_extract(reader: ArchiveReader, rounds: int) -> Dict[str, float]:
+    """
+        Samo parsowanie HTML - bez sieci i bez serwera.
+    """
+    pages = [entry.body.decode("utf-8", "replace") for _, entry in reader.entries() if entry.status == 200]
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for html in pages:
+            webscrapper.extract_datasheet(html)
+        best = min(best, time.perf_counter() - start)
+    return {"extract_datasheet": len(pages) / best}
+
+
+async def bench_fetchers(part_numbers: List[str], rounds: int, max_concurrent: int) -> Dict[str, float]:
+    """
+        Oba fetchery, kilka rund w jednej petli (cieple polaczenia jak w normalnym
+        uzyciu); liczy sie najlepsza runda.
+    """
+    expected = None
+    best = {"fetch_all_requests": float("inf"), "fetch_all_aiohttp": float("inf")}
+
+    try:
+        for _ in range(rounds):
+            for name, run in (
+                ("fetch_all_requests", lambda: webscrapper.fetch_all_requests(part_numbers)),
+                ("fetch_all_aiohttp", lambda: webscrapper.fetch_all_aiohttp(part_numbers, max_concurrent=max_concurrent)),
+            ):
+                output = await run()
+                best[name] = min(best[name], float(output["time_sec"]))
+
+                # Oba fetchery musza dawac te same wyniki
+                if expected is None:
+                    expected = output["result"]
+                elif output["result"] != expected:
+                    raise AssertionError(f"{name}: wyniki rozne od poprzedniego fetchera")
+    finally:
+        await close_session()
+
+    return {name: len(part_numbers) / seconds for name, seconds in best.items()}
+
+
+def compare(results: Dict[str, float], baseline: Dict[str, float], threshold: float) -> bool:
+    ok = True
+    print(f"\n{'benchmark':<22}{'strony/s':>12}{'baza':>12}{'zmiana':>10}")
+    for name, value in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"{name:<22}{value:>12.1f}{'-':>12}{'-':>10}")
+            continue
+        change = value / base - 1
+        failed = change < -threshold
+        ok = ok and not failed
+        print(f"{name:<22}{value:>12.1f}{base:>12.1f}{change:>+9.1%}{'  REGRESJA' if failed else ''}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archive", required=True)
+    parser.add_argument("--latency", choices=("recorded", "zero"), default="zero")
+    parser.add_argument("--rounds", type=int, default=3)
+    parser.add_argument("--max-concurrent", type=int, default=10)
+    parser.add_argument("--threshold", type=float, default=0.2, help="dopuszczalny spadek przepustowosci (0.2 = 20%%)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    reader = ArchiveReader(args.archive)
+    part_numbers = [m.group(1) for m in (PRODUCT_PATH.match(path) for path, _ in reader.entries()) if m]
+    if not part_numbers:
+        sys.exit(f"{args.archive}: brak stron produktow w archiwum")
+
+    server = ArchiveServer(("127.0.0.1", 0), reader=reader,
+                           latency_scale=1.0 if args.latency == "recorded" else 0.0).start()
+    webscrapper.BASE_URL = server.base_url
+    print(f"{len(part_numbers)} produktow z {args.archive}, opoznienia: {args.latency}")
+
+    results = bench_extract(reader, args.rounds)
+    results.update(asyncio.run(bench_fetchers(part_numbers, args.rounds, args.max_concurrent)))
+    server.shutdown()
+    if server.misses:
+        sys.exit(f"{server.misses} zapytan spoza archiwum - wyniki nieporownywalne")
+
+    # Baza osobno dla kazdego trybu opoznien
+    baselines = json.loads(args.baseline.read_text()) if args.baseline.exists() else {}
+    ok = compare(results, baselines.get(args.latency, {}), args.threshold)
+
+    if args.update_baseline:
+        baselines[args.latency] = {name: round(value, 2) for name, value in results.items()}
+        args.baseline.write_text(json.dumps(baselines, indent=2))
+        print(f"\nZapisano baze do {args.baseline}")
+    elif not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""
+    Wspolny punkt wejscia dla scraperow i zadan pomocniczych.
+
+    Ciezkie zaleznosci (Selenium, aiohttp, requests, bs4) sa ladowane dopiero
+    przez podkomende, ktora ich potrzebuje - `--help`, `archive` czy `bench`
+    nie placa za Selenium.
+
+        python -m webscrapping.cli sweep --max-pages 75
+        python -m webscrapping.cli datasheets --engine aiohttp --limit 10
+        python -m webscrapping.cli probe https://httpbin.org/ --count 100
+        python -m webscrapping.cli bench --archive te.archive
+        python -m webscrapping.cli archive replay --archive te.archive
+
+    --importtime wypisuje na stderr czas ladowania modulow uzytych przez
+    podkomende (jak `python -X importtime`, bez wpisow dla samego CLI):
+        python -m webscrapping.cli --importtime datasheets --limit 5
+"""
+import time
+
+_START = time.perf_counter()
+
+import argparse
+import importlib
+import sys
+from typing import Dict, List, Optional
+
+# Moduly zaladowane przez lazy_import: nazwa -> czas [s] (razem z zaleznosciami)
+_import_times: Dict[str, float] = {}
+
+PART_NUMBERS_FILE = "./webscrapping/te_part_numbers.json"
+
+
+def lazy_import(name: str):
+    """
+        importlib.import_module z pomiarem czasu - liczone tylko moduly, ktorych
+        jeszcze nie ma w sys.modules.
+
+        :param name: Pelna nazwa modulu, np. "webscrapping.webscrapper"
+            :type name: str
+
+        :return: Zaladowany modul
+            :rtype: module
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    _import_times[name] = time.perf_counter() - start
+    return module
+
+
+def run_async(coro_factory):
+    """
+        Uruchamia korutyne w nowej petli i zamyka wspoldzielona sesje HTTP
+        przed zakonczeniem petli.
+    """
+    import asyncio
+
+    http_client = lazy_import("lib.http_client")
+
+    async def runner():
+        try:
+            return await coro_factory()
+        finally:
+            await http_client.close_session()
+
+    return asyncio.run(runner())
+
+
+def cmd_sweep(args: argparse.Namespace) -> None:
+    te_scrapper = lazy_import("webscrapping.te_scrapper")
+
+    products = te_scrapper.scrape_te_products(max_pages=args.max_pages)
+    print(f"\nŁącznie znaleziono {len(products)} produktów")
+    te_scrapper.save_to_json(products=products, filename=args.output)
+
+
+def cmd_datasheets(args: argparse.Namespace) -> None:
+    import json
+
+    webscrapper = lazy_import("webscrapping.webscrapper")
+    # Silnik ladowany od razu, zeby jego koszt byl widoczny w --importtime
+    lazy_import(args.engine)
+
+    with open(args.input, "r") as file:
+        part_numbers: list = json.load(file)
+    if args.limit:
+        part_numbers = part_numbers[:args.limit]
+    print(f"[datasheets] : {len(part_numbers)} produktow, silnik: {args.engine}")
+
+    if args.engine == "aiohttp":
+        output = run_async(lambda: webscrapper.fetch_all_aiohttp(part_numbers, max_concurrent=args.max_concurrent))
+    else:
+        output = run_async(lambda: webscrapper.fetch_all_requests(part_numbers))
+
+    webscrapper.save_results(output["result"], args.output)
+
+
+def cmd_probe(args: argparse.Namespace) -> None:
+    # "async" to slowo kluczowe - modul tylko przez importlib
+    async_module = lazy_import("webscrapping.async")
+    lazy_import("aiohttp")
+
+    url_list = [url for url in args.urls for _ in range(args.count)]
+    output = run_async(lambda: async_module.AsyncURL(concurrency=args.concurrency).run(url_list=url_list))
+    print(f"[probe] : {len(url_list)} zapytan, sukces: {output['result']['success']:.1%} [{output['time_sec']}s]")
+
+
+def passthrough(module_name: str, prog: str, argv: List[str]) -> None:
+    """
+        Przekazuje argumenty do main() modulu z wlasnym argparse (bench, archive).
+    """
+    module = lazy_import(module_name)
+
+    saved_argv = sys.argv
+    sys.argv = [prog, *argv]
+    try:
+        module.main()
+    finally:
+        sys.argv = saved_argv
+
+
+def cmd_bench(args: argparse.Namespace) -> None:
+    passthrough("webscrapping.bench_scrapers", "webscrapping.cli bench", args.rest)
+
+
+def cmd_archive(args: argparse.Namespace) -> None:
+    passthrough("webscrapping.http_archive", "webscrapping.cli archive", args.rest)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="webscrapping.cli", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--importtime", action="store_true",
+                        help="czas startu i ladowania modulow podkomendy (stderr)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    sweep = commands.add_parser("sweep", help="lista produktow TE (Selenium)")
+    sweep.add_argument("--max-pages", type=int, default=75)
+    sweep.add_argument("--output", default=PART_NUMBERS_FILE)
+    sweep.set_defaults(func=cmd_sweep)
+
+    datasheets = commands.add_parser("datasheets", help="linki do datasheetow dla listy produktow")
+    datasheets.add_argument("--engine", choices=("aiohttp", "requests"), default="requests")
+    datasheets.add_argument("--input", default=PART_NUMBERS_FILE)
+    datasheets.add_argument("--limit", type=int, default=0, help="tylko pierwsze N produktow (0 = wszystkie)")
+    datasheets.add_argument("--max-concurrent", type=int, default=10)
+    datasheets.add_argument("--output", default="datasheets_results.json")
+    datasheets.set_defaults(func=cmd_datasheets)
+
+    probe = commands.add_parser("probe", help="test dostepnosci adresow (aiohttp)")
+    probe.add_argument("urls", nargs="+")
+    probe.add_argument("--count", type=int, default=1, help="zapytan na adres")
+    probe.add_argument("--concurrency", type=int, default=20)
+    probe.set_defaults(func=cmd_probe)
+
+    # Pozostale argumenty ida bez zmian do main() modulu (razem z --help)
+    bench = commands.add_parser("bench", help="benchmark regresji scraperow (bench_scrapers)", add_help=False)
+    bench.set_defaults(func=cmd_bench, passthrough=True)
+
+    archive = commands.add_parser("archive", help="nagrywanie / odtwarzanie odpowiedzi HTTP (http_archive)", add_help=False)
+    archive.set_defaults(func=cmd_archive, passthrough=True)
+
+    return parser
+
+
+def report_importtime(dispatch: float, end: float) -> None:
+    """
+        Raport w stylu `-X importtime`: laczny czas [us] | modul.
+    """
+    out = sys.stderr
+    for name, seconds in sorted(_import_times.items(), key=lambda item: item[1]):
+        print(f"import time: {seconds * 1e6:>10.0f} | {name}", file=out)
+    print(f"[cli] : start do podkomendy {(dispatch - _START) * 1e3:.1f} ms, "
+          f"importy podkomendy {sum(_import_times.values()) * 1e3:.1f} ms, "
+          f"razem {(end - _START) * 1e3:.1f} ms", file=out)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = build_parser()
+    args, rest = parser.parse_known_args(argv)
+    if getattr(args, "passthrough", False):
+        args.rest = rest
+    elif rest:
+        parser.error(f"nieznane argumenty: {' '.join(rest)}")
+
+    dispatch = time.perf_counter()
+    try:
+        args.func(args)
+    finally:
+        if args.importtime:
+            report_importtime(dispatch, time.perf_counter())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+    Archiwum odpowiedzi HTTP do powtarzalnych testow scraperow (bez te.com).
+
+    Format pliku: MAGIC, skompresowane (zlib) ciala odpowiedzi jedno za drugim,
+    indeks JSON (zlib) i na koncu offset indeksu (8 bajtow) + MAGIC.
+    Indeks: "GET /sciezka" -> [offset, dlugosc, status, content-type, czas odpowiedzi].
+
+    Nagrywanie (proxy do te.com, fetchery kierowane przez TE_BASE_URL):
+        python -m webscrapping.http_archive record --archive te.archive --port 8081
+        TE_BASE_URL=http://127.0.0.1:8081 python -m webscrapping.webscrapper
+
+    Odtwarzanie (czasy z nagrania albo --latency zero):
+        python -m webscrapping.http_archive replay --archive te.archive --port 8081
+"""
+import argparse
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, NamedTuple, Optional
+
+
+MAGIC = b"HTARCH1\n"
+TRAILER = struct.Struct("<Q")
+
+
+class Entry(NamedTuple):
+    status: int
+    content_type: str
+    body: bytes
+    elapsed: float
+
+
+class ArchiveWriter:
+    """
+        Dopisuje odpowiedzi do archiwum; indeks jest zapisywany w close().
+        Bezpieczny dla wielu watkow (serwer nagrywajacy).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index: Dict[str, list] = {}
+        self._lock = threading.Lock()
+        self._file = open(path, "wb")
+        self._file.write(MAGIC)
+
+    def add(self, method: str, path: str, status: int, content_type: str, body: bytes, elapsed: float) -> None:
+        data = zlib.compress(body, 6)
+        with self._lock:
+            offset = self._file.tell()
+            self._file.write(data)
+            # Powtorzone nagranie tego samego adresu - wygrywa ostatnie
+            self.index[f"{method} {path}"] = [offset, len(data), status, content_type, round(elapsed, 6)]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file.closed:
+                return
+            index_offset = self._file.tell()
+            self._file.write(zlib.compress(json.dumps(self.index).encode("utf-8")))
+            self._file.write(TRAILER.pack(index_offset) + MAGIC)
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ArchiveReader:
+    """
+        Odczyt archiwum: indeks ladowany raz, ciala czytane na zadanie.
+        Bezpieczny dla wielu watkow (serwer odtwarzajacy).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, "rb")
+
+        size = self._file.seek(0, os.SEEK_END)
+        tail = self._read(size - TRAILER.size - len(MAGIC), TRAILER.size + len(MAGIC))
+        if self._read(0, len(MAGIC)) != MAGIC or tail[TRAILER.size:] != MAGIC:
+            raise ValueError(f"{path} nie jest archiwum HTTP (brak znacznika {MAGIC!r})")
+
+        (index_offset,) = TRAILER.unpack(tail[:TRAILER.size])
+        raw_index = self._read(index_offset, size - TRAILER.size - len(MAGIC) - index_offset)
+        self.index: Dict[str, list] = json.loads(zlib.decompress(raw_index))
+
+    def _read(self, offset: int, length: int) -> bytes:
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.index
+
+    def get(self, method: str, path: str) -> Optional[Entry]:
+        item = self.index.get(f"{method} {path}")
+        if item is None:
+            return None
+        offset, length, status, content_type, elapsed = item
+        return Entry(status, content_type, zlib.decompress(self._read(offset, length)), elapsed)
+
+    def entries(self):
+        for key in self.index:
+            method, path = key.split(" ", 1)
+            yield path, self.get(method, path)
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ArchiveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def send_entry(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+
+        if server.writer is not None:
+            # Tylko nagrywanie potrzebuje klienta HTTP
+            from lib.http_client import get_sync_session
+
+            start = time.perf_counter()
+            try:
+                resp = get_sync_session().get(server.upstream + self.path, timeout=30)
+            except Exception as e:
+                return self.send_entry(502, "text/plain", f"upstream: {e}".encode())
+            elapsed = time.perf_counter() - start
+            content_type = resp.headers.get("Content-Type", "text/html")
+            server.writer.add("GET", self.path, resp.status_code, content_type, resp.content, elapsed)
+            return self.send_entry(resp.status_code, content_type, resp.content)
+
+        entry = server.reader.get("GET", self.path)
+        if entry is None:
+            server.count(hit=False)
+            return self.send_entry(404, "text/plain", b"not in archive")
+        if server.latency_scale:
+            time.sleep(entry.elapsed * server.latency_scale)
+        server.count(hit=True)
+        self.send_entry(entry.status, entry.content_type, entry.body)
+
+
+class ArchiveServer(ThreadingHTTPServer):
+    """
+        Lokalny zamiennik te.com: nagrywa (proxy do upstream) albo odtwarza archiwum.
+
+        :param latency_scale: 1.0 - opoznienia z nagrania, 0 - bez opoznien
+            :type latency_scale: float
+    """
+    daemon_threads = True
+
+    def __init__(self, address, reader: ArchiveReader = None, writer: ArchiveWriter = None,
+                 upstream: str = "https://www.te.com", latency_scale: float = 0.0):
+        super().__init__(address, ArchiveHandler)
+        self.reader = reader
+        self.writer = writer
+        self.upstream = upstream.rstrip("/")
+        self.latency_scale = latency_scale
+        self.hits = 0
+        self.misses = 0
+        # Obslugiwane z wielu watkow - `+=` bez blokady gubi zliczenia
+        self._count_lock = threading.Lock()
+
+    def count(self, hit: bool) -> None:
+        with self._count_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "ArchiveServer":
+        threading.Thread(target=self.serve_forever, name="http-archive", daemon=True).start()
+        return self
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Nagrywanie / odtwarzanie odpowiedzi HTTP scraperow")
+    parser.add_argument("mode", choices=("record", "replay"))
+    parser.add_argument("--archive", required=True)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--upstream", default="https://www.te.com")
+    parser.add_argument("--latency", choices=("recorded", "zero"), default="recorded")
+    args = parser.parse_args()
+
+    if args.mode == "record":
+        writer = ArchiveWriter(args.archive)
+        server = ArchiveServer(("127.0.0.1", args.port), writer=writer, upstream=args.upstream)
+    else:
+        reader = ArchiveReader(args.archive)
+        server = ArchiveServer(("127.0.0.1", args.port), reader=reader,
+                               latency_scale=1.0 if args.latency == "recorded" else 0.0)
+        print(f"Archiwum: {len(reader)} odpowiedzi")
+
+    print(f"[{args.mode}] : TE_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.mode == "record":
+            writer.close()
+            print(f"Zapisano {len(writer.index)} odpowiedzi do {args.archive}")
+        else:
+            print(f"Trafienia: {server.hits}, brak w archiwum: {server.misses}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,63 @@
-from lib.wrappers import debugIO, func_timing
-import webscrapping.te_scrapper as TEScrapper
+from __future__ import annotations
+
+from lib.wrappers import debugIO, func_timing, span, start_tracing, export_chrome_trace
+from lib.http_client import get_session, get_sync_session, close_session
 
 import asyncio
-import aiohttp
-import requests
-from bs4 import BeautifulSoup
 
+import os
 import json
-from typing import List, Dict, Tuple, Optional
+from typing import TYPE_CHECKING, List, Dict, Tuple, Optional
+
+# Selenium / requests / aiohttp / bs4 importowane dopiero w funkcjach, ktore
+# ich uzywaja - patrz webscrapping/cli.py
+if TYPE_CHECKING:
+    import aiohttp
+
+# Adres serwisu TE - do podmiany na lokalny serwer z archiwum (webscrapping/http_archive.py)
+TE_SITE: str = "https://www.te.com"
+BASE_URL: str = os.environ.get("TE_BASE_URL", TE_SITE)
+
+
+def product_url(part_number: str) -> str:
+    return f"{BASE_URL}/en/product-{part_number}.html"
+
+
+def extract_datasheet(html: str) -> Optional[str]:
+    """
+        Wyciaga z HTML strony produktu link do datasheetu (DS) z sekcji dokumentow.
+
+        :param html: Tresc strony produktu
+            :type html: str
+
+        :return: Pelny URL datasheetu albo None
+            :rtype: Optional[str]
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "html.parser")
+
+    div = soup.find("div", class_="documents-list")
+    if not div:
+        return None
+
+    for a in div.find_all("a"):
+        if a.text and "DS" in a.text:
+            href = a.get("href")
+
+            if href and href.startswith('/'):
+                href = TE_SITE + href
+            return href
+
+    return None
+
 
 @debugIO
 @func_timing
 def mat_list_preparing() -> None:
+    # Selenium ladowany tylko tutaj - pozostale funkcje modulu go nie potrzebuja
+    import webscrapping.te_scrapper as TEScrapper
+
     # Przygotowanie listy materiałów
     products = TEScrapper.scrape_te_products(
         max_pages=75
@@ -29,36 +75,22 @@ async def fetch_all_requests(part_numbers: list) -> dict:
     """
     Asynchroniczne pobieranie używając requests w wątkach
     """
-    
+    import requests
+
     def fetch_one_sync(part_number: str) -> Tuple[str, Optional[str]]:
         
-        url: str = f"https://www.te.com/en/product-{part_number}.html"
+        url: str = product_url(part_number)
         
         try:  
-            resp = requests.get(
-                url=url, 
-                timeout=20, 
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-                }
-            )
-            resp.raise_for_status() 
-
-            soup = BeautifulSoup(resp.text, "html.parser")
-
-            div = soup.find("div", class_="documents-list")
-            if not div:
-                return part_number, None
-
-            for a in div.find_all("a"):
-                if a.text and "DS" in a.text:
-                    href = a.get("href")
-                   
-                    if href and href.startswith('/'):
-                        href = 'https://www.te.com' + href
-                    return part_number, href
+            with span("http", part_number=part_number):
+                resp = get_sync_session().get(
+                    url=url, 
+                    timeout=20
+                )
+                resp.raise_for_status() 
 
-            return part_number, None
+            with span("parse_html"):
+                return part_number, extract_datasheet(resp.text)
         
         except requests.exceptions.RequestException as e:
             print(f"Błąd dla {part_number}: {e}")
@@ -77,38 +109,27 @@ async def fetch_all_aiohttp(part_numbers: list, max_concurrent: int = 10) -> dic
     """
     Asynchroniczne pobieranie używając aiohttp z limitem równoczesnych połączeń
     """
-    
+    import aiohttp
+
     async def fetch_one_async(  
         session: aiohttp.ClientSession, 
         part_number: str
     ) -> Tuple[str, Optional[str]]:  
         """Asynchroniczna funkcja pobierająca datasheet dla jednego produktu"""
         
-        url: str = f"https://www.te.com/en/product-{part_number}.html"
+        url: str = product_url(part_number)
 
         try: 
-            async with session.get(
-                url, 
-                timeout=aiohttp.ClientTimeout(total=20) 
-            ) as resp:
-                resp.raise_for_status() 
-                html = await resp.text()
-
-            soup = BeautifulSoup(html, "html.parser")
-
-            div = soup.find("div", class_="documents-list")
-            if not div:
-                return part_number, None
-
-            for a in div.find_all("a"):
-                if a.text and "DS" in a.text:
-                    href = a.get("href")
-                    
-                    if href and href.startswith('/'):
-                        href = 'https://www.te.com' + href
-                    return part_number, href
-
-            return part_number, None
+            with span("http", part_number=part_number):
+                async with session.get(
+                    url, 
+                    timeout=aiohttp.ClientTimeout(total=20) 
+                ) as resp:
+                    resp.raise_for_status() 
+                    html = await resp.text()
+
+            with span("parse_html"):
+                return part_number, extract_datasheet(html)
         
         except aiohttp.ClientError as e: 
             print(f"Błąd dla {part_number}: {e}")
@@ -124,16 +145,17 @@ async def fetch_all_aiohttp(part_numbers: list, max_concurrent: int = 10) -> dic
 
     async def bounded_fetch(session, pn):
         """Wrapper ograniczający liczbę równoczesnych połączeń"""
-        async with semaphore:
-            return await fetch_one_async(session, pn)
-
-    async with aiohttp.ClientSession(
-        headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
-    ) as session:
-        tasks = [bounded_fetch(session, pn) for pn in part_numbers]
-        results = await asyncio.gather(*tasks)
+        with span("bounded_fetch", part_number=pn):
+            with span("semaphore_wait"):
+                await semaphore.acquire()
+            try:
+                return await fetch_one_async(session, pn)
+            finally:
+                semaphore.release()
+
+    session = get_session()
+    tasks = [bounded_fetch(session, pn) for pn in part_numbers]
+    results = await asyncio.gather(*tasks)
 
     return dict(results)
 
@@ -165,8 +187,18 @@ async def main():
     test_list = part_numbers_list[:10]
     print(f"Testowanie z {len(test_list)} produktami\n")
     
-    # results = await fetch_all_aiohttp(test_list, max_concurrent=5)
-    results = await fetch_all_requests(test_list)
+    # TRACE_FILE=trace.json - os czasu calego pobierania do otwarcia w Perfetto
+    trace_file = os.environ.get("TRACE_FILE")
+    if trace_file:
+        start_tracing()
+
+    try:
+        # results = await fetch_all_aiohttp(test_list, max_concurrent=5)
+        results = await fetch_all_requests(test_list)
+    finally:
+        await close_session()
+        if trace_file:
+            print(f"Zapisano {export_chrome_trace(trace_file)} spanow do {trace_file}")
     
     save_results(results, "datasheets_results.json")
 